@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:24:27 2026
+
+Post-encoder checkpoints
+
+The encoder at the start of dep_circ and Real_circ is noiseless and the same in
+every shot, yet simulating the whole circuit replays it from |0...0〉 every time.
+split_at_noise cuts a circuit before the first moment with a non-unitary
+operation (noise, measurement or reset). checkpoint simulates that prefix once,
+and every shot starts from a copy of the resulting simulation state and only
+simulates the rest of the circuit.
+
+The checkpoint is a cirq simulation state rather than a state vector: a
+cirq.SimulationProductState of one cirq.StateVectorSimulationState per qudit,
+as cirq.Simulator builds it for |0...0〉. Qudits the encoder does not entangle
+(the ancillas) stay separate factors, as they would when simulating from
+|0...0〉. A dense initial state vector would merge them and make the rest of the
+shot slower.
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+
+def split_at_noise(circuit):
+    """The leading moments that only hold unitary gates, and the rest of the circuit."""
+    import cirq
+    for m, moment in enumerate(circuit):
+        if not all(cirq.has_unitary(op) for op in moment.operations):
+            return circuit[:m], circuit[m:]
+    return circuit, circuit[len(circuit):]
+
+def product_state(qudits, dtype=np.complex64, seed=None):
+    """The factorized |0...0〉 state of cirq.Simulator(dtype=dtype, seed=seed), built from public cirq classes."""
+    import cirq
+    prng = cirq.value.parse_random_state(seed)
+    classical_data = cirq.ClassicalDataDictionaryStore()
+    states = {q: cirq.StateVectorSimulationState(qubits=[q], initial_state=0, prng=prng, classical_data=classical_data, dtype=dtype) for q in qudits}
+    states[None] = cirq.StateVectorSimulationState(qubits=[], initial_state=0, prng=prng, classical_data=classical_data, dtype=dtype)
+    return cirq.SimulationProductState(states, qubits=list(qudits), split_untangled_states=True, classical_data=classical_data)
+
+class Checkpoint:
+
+    """The state after the noiseless prefix of a circuit, with the rest of the circuit.
+
+    start() gives a fresh copy for sim.simulate(checkpoint.rest, qubit_order=qudits, initial_state=checkpoint.start()).
+    dtype and seed are those of sim; the copies draw their measurements and noise from the random state of seed
+    (the global NumPy one for seed=None, like cirq.Simulator()).
+    """
+
+    def __init__(self, circuit, qudits, dtype=np.complex64, seed=None) -> None:
+        import cirq
+        prefix, self.rest = split_at_noise(circuit)
+        self.qudits = qudits
+        self._state = product_state(qudits, dtype, seed)
+        for op in prefix.all_operations():
+            cirq.act_on(op, self._state)
+
+    def start(self):
+        return self._state.copy()
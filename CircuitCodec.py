@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:14:36 2026
+
+Compact circuit format
+
+A circuit of the qudit gates and channels of this package is stored as an integer
+op list, one row per operation: (moment, opcode, qudit 0, qudit 1, param 0,
+param 1, param 2, param 3). Float parameters (the error probabilities of the
+channels) go in a separate table and the row holds their index, measurement keys
+likewise.
+A Real_circ of a few cycles becomes a few kilobytes, which is what is sent to
+worker processes instead of a pickled cirq.Circuit.
+
+decode rebuilds the circuit with cached gate instances, so every distinct gate
+and channel (with its Pauli tables) is created once per process.
+
+@author: James Keppens
+"""
+#Imports
+import importlib
+import pickle
+import zlib
+import numpy as np
+
+MEASURE = 0
+RESET = 1
+
+# opcode -> (module, class, ((attribute, type), ...)); the attributes are the constructor arguments in order
+GATES = [
+    None,
+    None,
+    ('Shift', 'Shift', (('_d', int), ('_a', int))),
+    ('Shift', 'Shiftdag', (('_d', int), ('_a', int))),
+    ('Phase', 'Phase', (('_d', int), ('_b', int))),
+    ('Phase', 'Phasedag', (('_d', int), ('_b', int))),
+    ('Phase', 'Pg', (('_d', int), ('_g', int))),
+    ('Phase', 'Pgdag', (('_d', int), ('_g', int))),
+    ('Y', 'Y', (('_d', int), ('_a', int), ('_b', int), ('_c', int))),
+    ('Y', 'Ydag', (('_d', int), ('_a', int), ('_b', int))),
+    ('QFT', 'H', (('_d', int),)),
+    ('QFT', 'Hinv', (('_d', int),)),
+    ('QFT', 'Hdag', (('_d', int),)),
+    ('Mul', 'M', (('_d', int), ('_g', int))),
+    ('Mul', 'Minv', (('_d', int), ('_g', int))),
+    ('Mul', 'Mdag', (('_d', int), ('_g', int))),
+    ('Id', 'I', (('_d', int),)),
+    ('SUM', 'SUM', (('_m', int), ('_n', int), ('_k', int))),
+    ('SUM', 'SUMinv', (('_m', int), ('_n', int))),
+    ('SUM', 'SUMdag', (('_m', int), ('_n', int))),
+    ('SUM', 'MIN', (('_m', int), ('_n', int))),
+    ('SUM', 'CShift', (('_m', int), ('_n', int), ('_k', int))),
+    ('Dchannel', 'depolarizeQudit', (('_p', float), ('_d', int))),
+    ('TwoDchannel', 'depolarizeTwoQudit', (('_p', float), ('_d', int), ('_full', int))),
+    ('BFChannel', 'BFd', (('_p', float), ('_d', int))),
+]
+_OPCODES = {(spec[0], spec[1]): opcode for opcode, spec in enumerate(GATES) if spec is not None}
+
+_cache = {}
+
+def _gate(opcode, params):
+    key = (opcode,) + tuple(params)
+    if key not in _cache:
+        module, name, _ = GATES[opcode]
+        _cache[key] = getattr(importlib.import_module(module), name)(*params)
+    return _cache[key]
+
+def encode(circuit, qudits=None):
+    """Encode a cirq circuit (or a [qudits, circuit] pair as returned by dep_circ/Real_circ) as an op list."""
+    import cirq
+    if isinstance(circuit, (list, tuple)):
+        qudits, circuit = circuit
+    if qudits is None:
+        qudits = sorted(circuit.all_qubits())
+    index = {q: i for i, q in enumerate(qudits)}
+    floats = {}
+    keys = []
+    rows = []
+    for m, moment in enumerate(circuit):
+        for op in moment.operations:
+            qs = [index[q] for q in op.qubits] + [-1] * (2 - len(op.qubits))
+            params = [0, 0, 0, 0]
+            gate = op.gate
+            if cirq.is_measurement(op):
+                opcode = MEASURE
+                params[0] = len(keys)
+                keys.append(cirq.measurement_key_name(op))
+            elif isinstance(gate, cirq.ResetChannel):
+                opcode = RESET
+            else:
+                opcode = _OPCODES.get((type(gate).__module__, type(gate).__name__))
+                if opcode is None or len(op.qubits) > 2:
+                    raise ValueError(f"Cannot encode {op}.")
+                for i, (attribute, kind) in enumerate(GATES[opcode][2]):
+                    value = getattr(gate, attribute)
+                    if kind is float:
+                        params[i] = floats.setdefault(float(value), len(floats))
+                    else:
+                        params[i] = int(value)
+            rows.append([m, opcode] + qs + params)
+    return {'qudits': np.array([(q.x, q.dimension) for q in qudits], dtype=np.int32),
+            'ops': np.array(rows, dtype=np.int32).reshape(-1, 8),
+            'floats': np.array(list(floats)),
+            'keys': keys}
+
+def decode(data):
+    """Rebuild [qudits, circuit] from an encoded op list, with cached gate instances."""
+    import cirq
+    qudits = [cirq.LineQid(int(x), dimension=int(dim)) for x, dim in data['qudits']]
+    floats = data['floats']
+    moments = {}
+    for m, opcode, q0, q1, *args in data['ops'].tolist():
+        targets = [qudits[q0]] if q1 < 0 else [qudits[q0], qudits[q1]]
+        if opcode == MEASURE:
+            op = cirq.measure(*targets, key=data['keys'][args[0]])
+        elif opcode == RESET:
+            op = cirq.reset(*targets)
+        else:
+            spec = GATES[opcode][2]
+            params = [floats[a] if kind is float else a for (_, kind), a in zip(spec, args)]
+            op = _gate(opcode, params).on(*targets)
+        moments.setdefault(m, []).append(op)
+    circuit = cirq.Circuit(cirq.Moment(moments.get(m, [])) for m in range(max(moments, default=-1) + 1))
+    return [qudits, circuit]
+
+def dumps(circuit, qudits=None):
+    # The op list repeats the same rows every cycle, so it compresses well
+    return zlib.compress(pickle.dumps(encode(circuit, qudits), protocol=pickle.HIGHEST_PROTOCOL))
+
+def loads(data):
+    return decode(pickle.loads(zlib.decompress(data)))
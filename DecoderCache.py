@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:13:19 2026
+
+Memoized decoding
+
+At low error rates most shots give an all-zero detector vector and a few
+non-trivial syndromes repeat many times. DecoderCache sits in front of a decoder
+(bmD.decode, graph.decode, a hook map lookup, ...) and keeps the results of the
+most recently used syndromes, keyed on the bit-packed detector vector plus the
+flag outcomes.
+
+The cache can be shared by the decoding threads of a Pipeline: lookups and
+updates hold a lock, the decoder itself runs outside it.
+
+@author: James Keppens
+"""
+#Imports
+import threading
+from collections import OrderedDict
+import numpy as np
+
+def is_trivial(detectors, flags=()):
+    # No syndrome and no flags: nothing to decode or correct
+    return not np.any(detectors) and not np.any(flags)
+
+class DecoderCache:
+
+    """A bounded least-recently-used cache around decode(detectors), or decode(detectors, flags) with pass_flags=True.
+    Binary detector vectors are bit-packed, others (e.g. raw ancilla outcomes) stored as bytes.
+    """
+
+    def __init__(self, decode, maxsize: int = 4096, binary: bool = True, pass_flags: bool = False) -> None:
+        if maxsize < 1:
+            raise ValueError("'maxsize' must be at least 1.")
+        self._decode = decode
+        self._maxsize = maxsize
+        self._binary = binary
+        self._pass_flags = pass_flags
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, detectors, flags=()):
+        detectors = np.asarray(detectors)
+        packed = np.packbits(detectors.astype(bool)) if self._binary else detectors.astype(np.int16)
+        return packed.tobytes() + b'|' + np.asarray(flags, dtype=np.int16).tobytes()
+
+    def __call__(self, detectors, flags=()):
+        key = self.key(detectors, flags)
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                self._results.move_to_end(key)
+                return self._results[key]
+            self.misses += 1
+        result = self._decode(detectors, flags) if self._pass_flags else self._decode(detectors)
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self._maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    @property
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def __len__(self):
+        return len(self._results)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:39:44 2026
+
+Compiled op-list executor
+
+dep_circ and Real_circ put almost every gate in a moment of its own, and for
+every moment cirq.Simulator pays Python dispatch, protocol lookups and buffer
+swaps. At d = 2 and d = 3 that costs more than the arithmetic. CompiledCircuit
+turns such a circuit once into a flat list of typed operations:
+
+    take     one-qudit permutation (+ phases): one np.take along the axis
+    diagonal diagonal gate: one broadcast multiplication in place
+    gather   multi-qudit permutation (+ phases): one np.take with a flat index
+    monomial multi-qudit permutation on states too large for a flat index
+    dft      non-monomial gate (QFT, fused gates): one matmul on the axes
+    noise    Pauli channel site
+    measure  and reset
+
+run executes the list in a tight loop over two preallocated state buffers.
+The noise of all sites is drawn up front with one call to the random generator;
+the Paulis of the sites that fire are applied like one-qudit permutations. The
+noiseless prefix of the circuit (the encoder) is simulated once when compiling.
+The measurements come out as {key: np.array([outcome])}, with the keys of the
+circuit (a1, ..., flag0, ...), like cirq's simulate.
+
+@author: James Keppens
+"""
+#Imports
+from collections import namedtuple
+import numpy as np
+import GateCore
+
+# Same attributes as the cirq simulation result used by Simulate and Simulate_Flag
+Result = namedtuple('Result', ['measurements', 'final_state_vector'])
+
+class CompiledCircuit:
+
+    """A circuit of the qudit gates and channels of this package, compiled for repeated shots.
+
+    max_index is the largest state (in amplitudes) for which multi-qudit permutations get a flat gather index.
+    """
+
+    def __init__(self, circuit, qudits, dtype=np.complex64, max_index: int = 1 << 20) -> None:
+        import Checkpoint
+        self.qudits = list(qudits)
+        self.n = len(self.qudits)
+        self.d = self.qudits[0].dimension
+        self.shape = (self.d,) * self.n
+        self.size = self.d**self.n
+        self.dtype = dtype
+        self.max_index = max_index
+        self._buffers = [np.zeros(self.shape, dtype=dtype), np.zeros(self.shape, dtype=dtype)]
+        self._cdfs = []
+        self._identity = []
+        self._paulis = []
+        self._pauli_ops = {}
+        prefix, rest = Checkpoint.split_at_noise(circuit)
+        state = self._buffers[0]
+        state[(0,) * self.n] = 1
+        self._start = self.execute(self.compile(prefix), None, None, state, self._buffers[1]).copy()
+        self.ops = self.compile(rest)
+        self.sites = len(self._cdfs)
+        self._identity = np.array(self._identity)
+
+    #Compilation
+    def _broadcast(self, axis):
+        shape = [1] * self.n
+        shape[axis] = self.d
+        return shape
+
+    def _monomial_ops(self, axes, perm, phases):
+        perm = np.asarray(perm)
+        phases = np.asarray(phases, dtype=self.dtype)
+        trivial = bool(np.all(phases == 1))
+        if np.array_equal(perm, np.arange(len(perm))):
+            if trivial:
+                return []
+            # Diagonal: the phases as an array that broadcasts over the other axes
+            order = np.argsort(axes)
+            diagonal = np.transpose(phases.reshape((self.d,) * len(axes)), order)
+            shape = [1] * self.n
+            for axis in axes:
+                shape[axis] = self.d
+            return [('diagonal', diagonal.reshape(shape))]
+        if len(axes) == 1:
+            # b[y] = phases[perm^-1[y]] a[perm^-1[y]]
+            inverse = np.empty_like(perm)
+            inverse[perm] = np.arange(len(perm))
+            return [('take', axes[0], inverse, None if trivial else phases[inverse].reshape(self._broadcast(axes[0])))]
+        shape = (self.d,) * len(axes)
+        if self.size > self.max_index:
+            return [('monomial', tuple(axes), shape, perm, phases)]
+        # The flat source index of every amplitude, found by moving an index tensor like the state
+        index = np.arange(self.size).reshape(self.shape)
+        index = GateCore.apply_monomial(index, np.empty_like(index), axes, shape, perm, np.ones(len(perm))).reshape(-1)
+        if trivial:
+            return [('gather', index, None)]
+        ones = np.ones(self.shape, dtype=self.dtype)
+        full = GateCore.apply_monomial(ones, np.empty_like(ones), axes, shape, perm, phases).reshape(-1)
+        return [('gather', index, full)]
+
+    def _trailing(self, axes, matrix):
+        # For a gate on one of the last axes: the matrix on the axis and everything after it (a few amplitudes),
+        # so the gate is one matrix product over all leading amplitudes instead of many tiny ones
+        if len(axes) != 1:
+            return None
+        right = self.d**(self.n - axes[0] - 1)
+        if self.d * right > 32:
+            return None
+        return np.kron(matrix, np.identity(right, dtype=self.dtype)).T.copy()
+
+    def _pauli_op(self, axis, code):
+        # X^x Z^z on one axis, cached per (axis, local code)
+        if (axis, code) not in self._pauli_ops:
+            ops = self._monomial_ops((axis,), *GateCore.pauli_monomial(self.d, code // self.d, code % self.d))
+            self._pauli_ops[(axis, code)] = ops
+        return self._pauli_ops[(axis, code)]
+
+    def compile(self, circuit):
+        """The typed op list of a circuit, as tuples (kind, ...)."""
+        import cirq
+        index = {q: i for i, q in enumerate(self.qudits)}
+        ops = []
+        for op in circuit.all_operations():
+            axes = tuple(index[q] for q in op.qubits)
+            gate = op.gate
+            if cirq.is_measurement(op):
+                ops.append(('measure', axes, cirq.measurement_key_name(op)))
+            elif isinstance(gate, cirq.ResetChannel):
+                ops.extend(('reset', axis) for axis in axes)
+            elif cirq.has_unitary(gate):
+                monomial = gate._monomial_() if hasattr(gate, '_monomial_') else None
+                if monomial is not None:
+                    ops.extend(self._monomial_ops(axes, *monomial))
+                else:
+                    matrix = np.asarray(cirq.unitary(gate), dtype=self.dtype)
+                    ops.append(('dft', axes, matrix.reshape((self.d,) * (2 * len(axes))), self._trailing(axes, matrix)))
+            elif hasattr(gate, '_paulis'):
+                probabilities = np.asarray(gate._probabilities, dtype=float)
+                cdf = np.cumsum(probabilities)
+                cdf /= cdf[-1]
+                paulis = [np.atleast_1d(c) for c in gate._paulis]
+                self._cdfs.append(cdf)
+                # A draw below the probability of a leading identity leaves the state alone
+                self._identity.append(cdf[0] if not np.any(paulis[0]) else 0.0)
+                self._paulis.append(paulis)
+                ops.append(('noise', axes, len(self._cdfs) - 1))
+            else:
+                raise ValueError(f"Cannot compile {op}.")
+        return ops
+
+    #Execution
+    def _measure(self, a, b, axis, prng, reset=False):
+        left = self.d**axis
+        a3 = a.reshape(left, self.d, -1)
+        # |amplitude|^2 summed over the leading axes with one product of the real view, then per outcome
+        parts = a.view(a.real.dtype).reshape(left, -1)
+        p = np.einsum('lc,lc->c', parts, parts).reshape(self.d, -1).sum(axis=1)
+        cdf = np.cumsum(p)
+        outcome = min(int(np.searchsorted(cdf, prng.random() * cdf[-1], side='right')), self.d - 1)
+        scale = 1 / np.sqrt(p[outcome])
+        target = 0 if reset else outcome
+        b3 = b.reshape(left, self.d, -1)
+        b3.fill(0)
+        np.multiply(a3[:, outcome, :], scale, out=b3[:, target, :])
+        return outcome, b, a
+
+    def _apply(self, op, a, b):
+        # a may have leading axes (e.g. shots, see ShotBatch.py) in front of the qudit axes
+        kind = op[0]
+        offset = a.ndim - self.n
+        lead = a.size // self.size
+        if kind == 'diagonal':
+            a *= op[1]
+            return a, b
+        if kind == 'take':
+            np.take(a, op[2], axis=op[1] + offset, out=b)
+            if op[3] is not None:
+                b *= op[3]
+            return b, a
+        if kind == 'gather':
+            flat = b.reshape(lead, self.size)
+            np.take(a.reshape(lead, self.size), op[1], axis=1, out=flat)
+            if op[2] is not None:
+                flat *= op[2]
+            return b, a
+        if kind == 'monomial':
+            result = GateCore.apply_monomial(a, b, tuple(axis + offset for axis in op[1]), *op[2:])
+            return (a, b) if result is a else (b, a)
+        if kind == 'dft':
+            axes = op[1]
+            if len(axes) == 1:
+                left = lead * self.d**axes[0]
+                right = self.size // (self.d**axes[0] * self.d)
+                if op[3] is not None:
+                    np.matmul(a.reshape(left, self.d * right), op[3], out=b.reshape(left, self.d * right))
+                else:
+                    np.matmul(op[2], a.reshape(left, self.d, right), out=b.reshape(left, self.d, right))
+            else:
+                k = len(axes)
+                axes = [axis + offset for axis in axes]
+                result = np.tensordot(op[2], a, axes=(list(range(k, 2 * k)), axes))
+                b[...] = np.moveaxis(result, list(range(k)), axes)
+            return b, a
+        raise ValueError(f"Unknown op {kind}.")
+
+    def execute(self, ops, prng, choices, a, b, measurements=None):
+        """Run an op list on the state in buffer a (b is scratch); returns the buffer holding the final state."""
+        for op in ops:
+            kind = op[0]
+            if kind == 'noise':
+                i = choices[op[2]]
+                if i:
+                    for axis, code in zip(op[1], self._paulis[op[2]][i]):
+                        if code:
+                            for pauli in self._pauli_op(axis, int(code)):
+                                a, b = self._apply(pauli, a, b)
+            elif kind == 'measure':
+                outcomes = []
+                for axis in op[1]:
+                    outcome, a, b = self._measure(a, b, axis, prng)
+                    outcomes.append(outcome)
+                measurements[op[2]] = np.array(outcomes)
+            elif kind == 'reset':
+                _, a, b = self._measure(a, b, op[1], prng, reset=True)
+            else:
+                a, b = self._apply(op, a, b)
+        return a
+
+    def sample_noise(self, prng):
+        """The index of the Pauli drawn at every noise site, 0 (the identity) for most of them."""
+        draws = prng.random(self.sites)
+        choices = np.zeros(self.sites, dtype=np.int64)
+        for s in np.flatnonzero(draws >= self._identity):
+            choices[s] = min(np.searchsorted(self._cdfs[s], draws[s], side='right'), len(self._cdfs[s]) - 1)
+        return choices
+
+    def run(self, prng=None):
+        """One shot from the encoded state. The final state vector is a view of an internal buffer, valid until the next run."""
+        if prng is None:
+            prng = np.random.default_rng()
+        a, b = self._buffers
+        np.copyto(a, self._start)
+        measurements = {}
+        state = self.execute(self.ops, prng, self.sample_noise(prng), a, b, measurements)
+        return Result(measurements, state.reshape(-1))
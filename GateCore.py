@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:02:17 2026
+
+Dependency-light gate core
+
+The matrices, permutations and diagonals behind the qudit gates and channels.
+This module only imports NumPy, so it can be loaded by worker processes without
+pulling in cirq. The cirq.Gate classes in Shift.py, SUM.py, ... are built lazily
+on first use through lazy_gates.
+
+Except for the QFT, all gates and Paulis are monomial: U|x〉 = phases[x]|perm[x]〉.
+The pair (perm, phases) has d^k entries instead of d^2k, and apply_monomial
+applies it to a state tensor without ever building the matrix.
+
+@author: James Keppens
+"""
+#Imports
+import sys
+import numpy as np
+
+#Permutations: U|x〉 = |perm[x]〉
+def shift_permutation(d, a):
+    # The shift matrix np.roll(np.eye(d), -a, axis=0) sends |x〉 to |x - a mod d〉
+    return (np.arange(d) - a) % d
+
+def multiplication_permutation(d, g):
+    return (np.arange(d) * g) % d
+
+def sum_permutation(m, n, sign=1):
+    # SUM|x〉|y〉 = |x〉|y + sign*x mod n〉 on the flattened index x*n + y
+    x, y = np.divmod(np.arange(m * n), n)
+    return x * n + (y + sign * x) % n
+
+def cshift_permutation(m, n, k=1):
+    x, y = np.divmod(np.arange(m * n), n)
+    return x * n + (y + k * (x != 0)) % n
+
+def permutation_matrix(perm, dtype=np.complex128):
+    matrix = np.zeros((len(perm), len(perm)), dtype=dtype)
+    matrix[perm, np.arange(len(perm))] = 1
+    return matrix
+
+#Diagonals
+def roots_of_unity_diagonal(d, b):
+    return np.exp(2j * np.pi * ((np.arange(d) * b) % d) / d)
+
+def pg_diagonal(d, g):
+    w = np.exp(2j * np.pi / d)
+    return np.array([w**(i**2 * g / 2) for i in range(d)])
+
+#Matrices
+def shift_matrix(d, a):
+    if d < 2:
+        raise ValueError("Dimension 'd' must be at least 2.")
+    if a > d:
+        raise ValueError("Shift cannot be larger than the Dimension 'd'")
+    # Perform the shift operation (x -> x+1 mod d) on the matrix
+    return np.roll(np.eye(d), -1*a, axis=0)
+
+def roots_of_unity_matrix(d, b):
+    if d < 1:
+        raise ValueError("Dimension 'd' must be at least 1.")
+    if b > d:
+        raise ValueError("b cannot be larger than the Dimension 'd'")
+    # Create a diagonal matrix with the d roots of unity
+    return np.diag(roots_of_unity_diagonal(d, b))
+
+def y_matrix(d, a, b):
+    return shift_matrix(d, a) @ roots_of_unity_matrix(d, b)
+
+def qft_matrix(d):
+    a = np.arange(d)
+    return np.exp(2j * np.pi * np.outer(a, a) / d) / np.sqrt(d)
+
+def multiplication_matrix(d, g):
+    # Check if g is within the valid range
+    if g < 1 or g >= d:
+        raise ValueError("Invalid value for 'g'. It must be in the range (1, d-1).")
+    return permutation_matrix(multiplication_permutation(d, g))
+
+def pg_matrix(d, g):
+    return np.diag(pg_diagonal(d, g))
+
+def sum_matrix(m, n, sign=1):
+    if m < 1 or n < 1:
+        raise ValueError("Both 'm' and 'n' must be at least 1.")
+    return permutation_matrix(sum_permutation(m, n, sign))
+
+def cshift_matrix(m, n, k=1):
+    if m < 1 or n < 1:
+        raise ValueError("Both 'm' and 'n' must be at least 1.")
+    return permutation_matrix(cshift_permutation(m, n, k))
+
+#Monomial (permutation + phase) representation: U|x〉 = phases[x]|perm[x]〉
+def shift_monomial(d, a):
+    return shift_permutation(d, a), np.ones(d, dtype=np.complex128)
+
+def diagonal_monomial(diagonal):
+    return np.arange(len(diagonal)), np.asarray(diagonal, dtype=np.complex128)
+
+def permutation_monomial(perm):
+    return np.asarray(perm), np.ones(len(perm), dtype=np.complex128)
+
+def pauli_monomial(d, x, z):
+    # X^x Z^z|k〉 = w^(z*k)|k - x〉
+    return shift_permutation(d, x), roots_of_unity_diagonal(d, z)
+
+def monomial_inverse(perm, phases):
+    inverse = np.empty_like(perm)
+    inverse[perm] = np.arange(len(perm))
+    return inverse, np.conjugate(phases)[inverse]
+
+def monomial_kron(first, second):
+    # Monomial of the tensor product, with the first factor on the most significant digit
+    (perm0, phases0), (perm1, phases1) = first, second
+    n = len(perm1)
+    return (perm0[:, None] * n + perm1[None, :]).ravel(), np.outer(phases0, phases1).ravel()
+
+def monomial_matrix(perm, phases):
+    matrix = np.zeros((len(perm), len(perm)), dtype=np.complex128)
+    matrix[perm, np.arange(len(perm))] = phases
+    return matrix
+
+def monomial_to_sparse(perm, phases):
+    """Return the monomial as a scipy.sparse CSR matrix with len(perm) non-zeros."""
+    from scipy import sparse
+    n = len(perm)
+    return sparse.csr_matrix((phases, (perm, np.arange(n))), shape=(n, n))
+
+def slice_index(ndim, axes, digits):
+    index = [slice(None)] * ndim
+    for axis, digit in zip(axes, digits):
+        # A length-1 slice keeps the result a view, also when every axis is indexed
+        index[axis] = slice(digit, digit + 1)
+    return tuple(index)
+
+def apply_monomial(target, buffer, axes, shape, perm, phases):
+    """Apply U|x〉 = phases[x]|perm[x]〉 on the given axes of a state tensor.
+
+    Diagonal gates work in place on target, other gates write into buffer (same
+    shape as target). Returns the array holding the result, as expected by
+    cirq's _apply_unitary_.
+    """
+    n = len(perm)
+    trivial = np.all(phases == 1)
+    if len(axes) == 1:
+        # Single qudit: one gather along the axis and one broadcast multiplication
+        broadcast = [1] * target.ndim
+        broadcast[axes[0]] = n
+        if np.array_equal(perm, np.arange(n)):
+            target *= phases.reshape(broadcast)
+            return target
+        inverse = np.empty_like(perm)
+        inverse[perm] = np.arange(n)
+        np.take(target, inverse, axis=axes[0], out=buffer)
+        if not trivial:
+            buffer *= phases[inverse].reshape(broadcast)
+        return buffer
+    if np.array_equal(perm, np.arange(n)):
+        for x in range(n):
+            if phases[x] != 1:
+                target[slice_index(target.ndim, axes, np.unravel_index(x, shape))] *= phases[x]
+        return target
+    for x in range(n):
+        source = slice_index(target.ndim, axes, np.unravel_index(x, shape))
+        destination = slice_index(target.ndim, axes, np.unravel_index(perm[x], shape))
+        if phases[x] == 1:
+            buffer[destination] = target[source]
+        else:
+            np.multiply(target[source], phases[x], out=buffer[destination])
+    return buffer
+
+#Lazy cirq wrappers
+def lazy_gates(module_name, build):
+    """Return a module-level __getattr__ that creates the module's cirq.Gate classes on first use.
+
+    build() imports cirq and returns the gate classes. They are stored on the module,
+    so they pickle and compare like normally defined classes.
+    """
+    def __getattr__(name):
+        module = sys.modules[module_name]
+        if name.startswith('__') or '_gates_built' in vars(module):
+            raise AttributeError(f"module '{module_name}' has no attribute '{name}'")
+        for cls in build():
+            cls.__module__ = module_name
+            cls.__qualname__ = cls.__name__
+            setattr(module, cls.__name__, cls)
+        module._gates_built = True
+        return getattr(module, name)
+    return __getattr__
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:29:13 2026
+
+Hook map generation by fault propagation
+
+The hook maps used by Simulate_Flag (hook_map2.pkl, hook_map3.pkl,
+hook_map5.pkl) map the flag and syndrome outcomes of a single fault to the data
+error it leaves behind. generate builds such a table for any d and any flagged
+schedule: every Pauli of every noise channel in the circuit is injected on its
+own and propagated through the Clifford circuit with PauliFrame, side by side in
+one frame array per chunk of faults. Faults that raise a flag give an entry
+with the flags, the raw ancilla measurements (in the order of Simulate_Flag)
+and the data part of the final frame as the correction for C_circ_Flag. When
+several faults give the same outcomes, the lowest-weight correction is kept.
+
+A generated map covers exactly the Paulis of the circuit's channels. At d = 2
+it has every entry of hook_map2.pkl with the same correction (compare checks
+this). The shipped maps for d >= 3 were made with all d^4 - 1 two-qudit
+Paulis, so they are only matched by the circuits built with
+depolarizeTwoQudit(p, d, full_paulis=True); with the default channel (see
+TwoDchannel.py) a part of their entries has no fault.
+
+Chunks of faults can be propagated in worker processes. The circuit is sent to
+them in the CircuitCodec format. cached stores the table in a pickle named
+after d and a digest of the circuit, so a changed schedule gets a new table.
+
+@author: James Keppens
+"""
+#Imports
+import hashlib
+import os
+import pickle
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import CircuitCodec
+import Pauli
+import PauliFrame
+
+def fault_locations(circuit, qudits):
+    """All single faults (moment, qudit indices, local Pauli codes) of the Pauli noise channels of a circuit."""
+    index = {q: i for i, q in enumerate(qudits)}
+    faults = []
+    for m, moment in enumerate(circuit):
+        for op in moment.operations:
+            paulis = getattr(op.gate, '_paulis', None)
+            if paulis is None:
+                continue
+            idx = tuple(index[q] for q in op.qubits)
+            for codes in paulis:
+                codes = tuple(int(c) for c in np.atleast_1d(codes))
+                if any(codes):
+                    faults.append((m, idx, codes))
+    return faults
+
+def _measurement_keys(measurements, cycles):
+    syndrome = [f'{letter}{i}' for i in range(1, cycles + 1) for letter in ['a', 'b', 'c', 'd']]
+    flags = sorted((key for key in measurements if key.startswith('flag')), key=lambda key: int(key[4:]))
+    return syndrome, flags
+
+def propagate_faults(circuit, qudits, faults, d, data=5):
+    """Flags, measurements and data error codes of every fault, each propagated on its own frame."""
+    injections = {}
+    for f, (m, idx, codes) in enumerate(faults):
+        if (m, idx) not in injections:
+            injections[(m, idx)] = np.zeros((len(faults), len(idx), 2), dtype=np.int64)
+        injections[(m, idx)][f, :, 0] = [c // d for c in codes]
+        injections[(m, idx)][f, :, 1] = [c % d for c in codes]
+    measurements, frame = PauliFrame.propagate(circuit, d, frames=len(faults), injections=injections, qudits=qudits)
+    cycles = sum(1 for key in measurements if key.startswith('a') and key[1:].isdigit())
+    syndrome, flags = _measurement_keys(measurements, cycles)
+    syndrome = np.stack([measurements[key] for key in syndrome], axis=1) if syndrome else np.zeros((len(faults), 0), dtype=np.int64)
+    flags = np.stack([measurements[key] for key in flags], axis=1) if flags else np.zeros((len(faults), 0), dtype=np.int64)
+    results = []
+    for f in range(len(faults)):
+        errors = [Pauli.encode(q, frame[f, q, 0], frame[f, q, 1], d) for q in range(data) if frame[f, q, 0] or frame[f, q, 1]]
+        results.append((flags[f].tolist(), syndrome[f].tolist(), [int(e) for e in errors]))
+    return results
+
+def _worker(blob, faults, d, data):
+    qudits, circuit = CircuitCodec.loads(blob)
+    return propagate_faults(circuit, qudits, faults, d, data)
+
+def generate(circuit, qudits, d, data=5, workers=1, chunk=4096):
+    """The hook map of a flagged circuit, as {(flags, measurements): {'flags', 'measurements', 'correction', 'faults'}}."""
+    faults = fault_locations(circuit, qudits)
+    chunks = [faults[i:i + chunk] for i in range(0, len(faults), chunk)]
+    if workers > 1 and len(chunks) > 1:
+        blob = CircuitCodec.dumps(circuit, qudits)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_worker, [blob] * len(chunks), chunks, [d] * len(chunks), [data] * len(chunks)))
+    else:
+        parts = [propagate_faults(circuit, qudits, part, d, data) for part in chunks]
+    hook_map = {}
+    for flags, measurements, correction in (entry for part in parts for entry in part):
+        if not any(flags):
+            continue
+        key = (tuple(flags), tuple(measurements))
+        if key not in hook_map:
+            hook_map[key] = {'flags': flags, 'measurements': measurements, 'correction': correction, 'faults': 0}
+        elif len(correction) < len(hook_map[key]['correction']):
+            hook_map[key]['correction'] = correction
+        hook_map[key]['faults'] += 1
+    return hook_map
+
+def _product(codes, d):
+    # The Pauli of a list of codes per qudit, up to a phase
+    product = {}
+    for code in codes:
+        q, x, z = Pauli.decode(int(code), d)
+        px, pz = product.get(q, (0, 0))
+        product[q] = ((px + x) % d, (pz + z) % d)
+    return {q: xz for q, xz in product.items() if xz != (0, 0)}
+
+def compare(generated, shipped, d):
+    """The entries of shipped (e.g. a loaded hook_map pickle) missing from generated, and those with another correction (up to a phase)."""
+    missing = []
+    different = []
+    for entry in shipped.values():
+        key = (tuple(int(f) for f in entry['flags']), tuple(int(m) for m in entry['measurements']))
+        if key not in generated:
+            missing.append(key)
+        elif _product(generated[key]['correction'], d) != _product(entry.get('correction', []), d):
+            different.append(key)
+    return missing, different
+
+def digest(circuit, qudits=None):
+    # The schedule only: the error probabilities do not change which faults exist
+    encoded = CircuitCodec.encode(circuit, qudits)
+    return hashlib.sha1(encoded['qudits'].tobytes() + encoded['ops'].tobytes() + '|'.join(encoded['keys']).encode()).hexdigest()[:12]
+
+def cached(circuit, qudits, d, folder='.', data=5, workers=1):
+    """Load the hook map of this circuit from folder, or generate and store it there."""
+    path = os.path.join(folder, f'hook_map{d}_{digest(circuit, qudits)}.pkl')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    hook_map = generate(circuit, qudits, d, data, workers)
+    os.makedirs(folder, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(hook_map, f)
+    return hook_map
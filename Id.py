@@ -6,29 +6,62 @@ Created on Tue Aug  6 10:45:14 2024
 Based on https://quantumai.google/cirq/build/qudits
 """
 #Imports
-import cirq
 import numpy as np
+import GateCore
+import Kernels
 
-class I(cirq.Gate):
-    
-    def __init__(self, d: int) -> None:
-        self._d = d
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.eye(self._d))
-
-    def _circuit_diagram_info_(self, args):
-        return f'[I]'
\ No newline at end of file
+def _gates():
+    import cirq
+
+    @cirq.value_equality(manual_cls=True)
+    class I(cirq.Gate):
+        
+        def __init__(self, d: int) -> None:
+            self._d = d
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d,
+
+        def _value_equality_values_cls_(self):
+            return I
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return self
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.eye(self._d))
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.diagonal_monomial(np.ones(self._d))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return f'[I]'
+
+    return (I,)
+
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:08:36 2026
+
+Multi-threaded state-vector kernels
+
+The monomial gates (SUM, Shift, Phase, ...) permute and rephase slices of the
+state tensor. For large states (e.g. 10 qudits of dimension 5) these kernels
+apply the gate in place and split the work over a thread pool along axes the
+gate does not touch. Every thread works on its own part of the state and NumPy
+releases the GIL while copying and multiplying, so one shot uses all cores.
+
+Threading is off by default, switch it on with set_threads. Small states and
+runs with one thread use GateCore.apply_monomial.
+
+@author: James Keppens
+"""
+#Imports
+import itertools
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import GateCore
+
+_threads = 1
+_min_size = 1 << 16
+_pool = None
+
+def set_threads(threads=None, min_size=1 << 16):
+    """Use this many threads (all cores for None) for states with at least min_size amplitudes."""
+    global _threads, _min_size, _pool
+    if threads is None:
+        threads = os.cpu_count() or 1
+    if threads < 1:
+        raise ValueError("'threads' must be at least 1.")
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+    _threads = threads
+    _min_size = min_size
+    if threads > 1:
+        _pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='kernels')
+
+def get_threads():
+    return _threads
+
+def _cycles(perm):
+    # Cycles of length > 1 of a permutation
+    seen = np.zeros(len(perm), dtype=bool)
+    cycles = []
+    for start in range(len(perm)):
+        if seen[start] or perm[start] == start:
+            seen[start] = True
+            continue
+        cycle = [start]
+        seen[start] = True
+        x = perm[start]
+        while x != start:
+            cycle.append(x)
+            seen[x] = True
+            x = perm[x]
+        cycles.append(cycle)
+    return cycles
+
+def _move(source, phase, destination):
+    if phase == 1:
+        np.copyto(destination, source)
+    else:
+        np.multiply(source, phase, out=destination)
+
+def apply_monomial_inplace(target, axes, shape, perm, phases):
+    """Apply U|x〉 = phases[x]|perm[x]〉 on the given axes of target, in place.
+
+    Each cycle of perm is rotated with one slice as temporary storage, so the
+    extra memory is a 1/d^k part of target instead of a full buffer.
+    """
+    def index(x):
+        return GateCore.slice_index(target.ndim, axes, np.unravel_index(x, shape))
+    moved = np.zeros(len(perm), dtype=bool)
+    for cycle in _cycles(perm):
+        # new[c_(i+1)] = phases[c_i]*old[c_i], walked backwards from the end of the cycle
+        last = cycle[-1]
+        temp = target[index(last)].copy()
+        for i in range(len(cycle) - 1, 0, -1):
+            _move(target[index(cycle[i - 1])], phases[cycle[i - 1]], target[index(cycle[i])])
+        _move(temp, phases[last], target[index(cycle[0])])
+        moved[cycle] = True
+    for x in np.flatnonzero(~moved):
+        if phases[x] != 1:
+            target[index(x)] *= phases[x]
+    return target
+
+def _chunks(target, axes):
+    # Index tuples that fix enough untouched axes to give every thread a few independent parts
+    free = sorted((a for a in range(target.ndim) if a not in axes), key=lambda a: -target.shape[a])
+    chosen = []
+    parts = 1
+    for a in free:
+        if parts >= 4 * _threads:
+            break
+        chosen.append(a)
+        parts *= target.shape[a]
+    chunks = []
+    for values in itertools.product(*(range(target.shape[a]) for a in chosen)):
+        index = [slice(None)] * target.ndim
+        for a, v in zip(chosen, values):
+            index[a] = slice(v, v + 1)
+        chunks.append(tuple(index))
+    return chunks
+
+def apply_monomial_parallel(target, axes, shape, perm, phases):
+    """apply_monomial_inplace on independent parts of target in the thread pool."""
+    chunks = _chunks(target, axes)
+    if _pool is None or len(chunks) < 2:
+        return apply_monomial_inplace(target, axes, shape, perm, phases)
+    jobs = [_pool.submit(apply_monomial_inplace, target[chunk], axes, shape, perm, phases) for chunk in chunks]
+    for job in jobs:
+        job.result()
+    return target
+
+def apply_monomial(target, buffer, axes, shape, perm, phases):
+    """Entry point for the gates' _apply_unitary_: threaded and in place for large states."""
+    if _threads > 1 and target.size >= _min_size:
+        return apply_monomial_parallel(target, axes, shape, perm, phases)
+    return GateCore.apply_monomial(target, buffer, axes, shape, perm, phases)
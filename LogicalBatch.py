@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:20:44 2026
+
+Batched logical-basis simulation
+
+Simulate only prepares |0_L〉, so only errors that shift the logical Z basis
+label are seen. LogicalBatch carries a leading batch axis over the d logical Z
+basis states X_L^k|0_L〉 and the d Fourier basis states
+sum_k w^(jk) X_L^k|0_L〉/sqrt(d), with X_L the Shift(d,1) on every data qudit
+(as in Initial_state(d, L)). All 2d inputs go through the same sampled fault
+trajectory: every Pauli of a noise channel is drawn once and applied to the
+whole batch, and every measurement outcome is drawn once and the whole batch is
+collapsed on it. For Pauli noise on a stabilizer code the syndrome does not
+depend on the logical input, so this is one shot for all inputs.
+
+After the correction, logical_error returns the residual logical Pauli of the
+shot as (a, b): the Z basis inputs k end up in k + a and the Fourier basis
+inputs j in j + b. Counting (a, b) over the shots gives the logical error
+channel. A value d means the corrected state is not in the code space.
+
+The circuit must start with a noiseless encoder on the data qudits, with the
+ancillas in |0〉, as dep_circ and Real_circ do. The inputs are prepared once
+from the state after this encoder.
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+import Checkpoint
+
+class LogicalBatch:
+
+    """The 2d logical inputs of a circuit on the given qudits, the first `data` of which hold the code.
+    """
+
+    def __init__(self, circuit, qudits, data: int = 5, dtype=np.complex64) -> None:
+        import cirq
+        d = qudits[0].dimension
+        n = len(qudits)
+        self.d = d
+        self.n = n
+        self.data = data
+        self.qudits = qudits
+        self.index = {q: i for i, q in enumerate(qudits)}
+        prefix, self.circuit = Checkpoint.split_at_noise(circuit)
+        encoded = cirq.final_state_vector(prefix, qubit_order=qudits, dtype=np.complex128).reshape(d**data, -1)
+        if abs(np.linalg.norm(encoded[:, 0]) - 1) > 1e-6:
+            raise ValueError("The noiseless start of the circuit must leave the ancillas in |0〉.")
+        # Z basis code states on the data qudits: Shift(d,k) on every data qudit maps |x〉 to |x - k〉
+        code = encoded[:, 0].reshape((d,) * data)
+        zbasis = np.array([np.roll(code, -k, axis=tuple(range(data))) for k in range(d)]).reshape(d, -1)
+        dft = np.exp(2j * np.pi * np.outer(np.arange(d), np.arange(d)) / d) / np.sqrt(d)
+        fourier = dft @ zbasis
+        self.references = (zbasis, fourier)
+        inputs = np.zeros((2 * d, d**data, d**(n - data)), dtype=dtype)
+        inputs[:d, :, 0] = zbasis
+        inputs[d:, :, 0] = fourier
+        self.inputs = inputs.reshape((2 * d,) + (d,) * n)
+
+    def apply_gate(self, tensor, buffer, gate, axes):
+        import cirq
+        result = cirq.apply_unitary(gate, cirq.ApplyUnitaryArgs(tensor, buffer, [a + 1 for a in axes]))
+        if result is buffer:
+            return buffer, tensor
+        if result is not tensor:
+            np.copyto(tensor, result)
+        return tensor, buffer
+
+    def apply_pauli(self, tensor, buffer, axes, codes):
+        import Y
+        d = self.d
+        for axis, c in zip(axes, np.atleast_1d(codes)):
+            if c != 0:
+                tensor, buffer = self.apply_gate(tensor, buffer, Y.Y(d, int(c) // d, int(c) % d), (axis,))
+        return tensor, buffer
+
+    def measure(self, tensor, axis, prng=np.random, reset=False):
+        """Measure one qudit with one outcome for the whole batch, collapse every input and optionally reset the qudit to |0〉."""
+        others = tuple(a for a in range(1, tensor.ndim) if a != axis + 1)
+        p = np.sum(np.abs(tensor)**2, axis=others)
+        norms = p.sum(axis=1)
+        alive = norms > 1e-12
+        # The outcome is drawn from the batch average, the inputs agree on it for a stabilizer measurement
+        average = np.mean(p[alive] / norms[alive, None], axis=0)
+        outcome = prng.choice(range(self.d), p=average / np.sum(average))
+        scale = np.zeros(len(tensor))
+        kept = p[:, outcome] > 1e-12 * np.maximum(norms, 1e-30)
+        scale[kept] = 1 / np.sqrt(p[kept, outcome] / norms[kept])
+        part = np.take(tensor, [outcome], axis=axis + 1) * scale.reshape((-1,) + (1,) * self.n).astype(tensor.dtype)
+        tensor[...] = 0
+        target = [slice(None)] * tensor.ndim
+        target[axis + 1] = slice(0, 1) if reset else slice(outcome, outcome + 1)
+        tensor[tuple(target)] = part
+        return outcome
+
+    def act(self, tensor, buffer, op, prng=np.random):
+        import cirq
+        axes = tuple(self.index[q] for q in op.qubits)
+        gate = op.gate
+        if cirq.is_measurement(op):
+            return tensor, buffer, self.measure(tensor, axes[0], prng)
+        if isinstance(gate, cirq.ResetChannel):
+            self.measure(tensor, axes[0], prng, reset=True)
+        elif cirq.has_unitary(gate):
+            tensor, buffer = self.apply_gate(tensor, buffer, gate, axes)
+        elif hasattr(gate, '_paulis'):
+            # Pauli channels: one Pauli for the whole batch
+            i = prng.choice(range(len(gate._probabilities)), p=gate._probabilities)
+            tensor, buffer = self.apply_pauli(tensor, buffer, axes, gate._paulis[i])
+        else:
+            raise ValueError(f"Cannot simulate {op} on a logical batch.")
+        return tensor, buffer, None
+
+    def simulate(self, prng=np.random):
+        """One shot for all inputs. Returns the measurements, as {key: np.array([outcome])} like cirq's simulate, and the batch tensor."""
+        import cirq
+        tensor = self.inputs.copy()
+        buffer = np.empty_like(tensor)
+        measurements = {}
+        for op in self.circuit.all_operations():
+            tensor, buffer, outcome = self.act(tensor, buffer, op, prng)
+            if outcome is not None:
+                measurements[cirq.measurement_key_name(op)] = np.array([outcome])
+        return measurements, tensor
+
+    def apply_circuit(self, tensor, circuit):
+        """Apply the unitary gates of a circuit (e.g. a correction) to every input; returns the new tensor."""
+        buffer = np.empty_like(tensor)
+        for op in circuit.all_operations():
+            tensor, buffer, _ = self.act(tensor, buffer, op)
+        return tensor
+
+    def overlaps(self, tensor):
+        """Probabilities (2d, d) of the inputs to end in each logical basis state, summed over the ancillas."""
+        d = self.d
+        amplitudes = tensor.reshape(2 * d, d**self.data, -1)
+        zbasis, fourier = self.references
+        z = np.einsum('kx,bxa->bka', np.conjugate(zbasis), amplitudes[:d])
+        f = np.einsum('kx,bxa->bka', np.conjugate(fourier), amplitudes[d:])
+        return np.concatenate([np.sum(np.abs(z)**2, axis=2), np.sum(np.abs(f)**2, axis=2)])
+
+    def logical_error(self, tensor, atol=1e-3):
+        """The residual logical Pauli (a, b) of a corrected shot, with d for a state outside the code space."""
+        d = self.d
+        overlaps = self.overlaps(tensor)
+        labels = np.argmax(overlaps, axis=1)
+        found = overlaps[np.arange(2 * d), labels] > 1 - atol
+        shifts = (labels - np.tile(np.arange(d), 2)) % d
+        result = []
+        for part in (slice(0, d), slice(d, 2 * d)):
+            # Every input of a basis must see the same shift
+            if np.all(found[part]) and np.all(shifts[part] == shifts[part][0]):
+                result.append(int(shifts[part][0]))
+            else:
+                result.append(d)
+        return tuple(result)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:11:05 2026
+
+Syndrome lookup decoder for the 5-qudit code
+
+The table holds one minimum-weight correction for each of the d^4 values of the
+(a, b, c, d) ancilla syndrome, so decoding a batch of shots is a single fancy
+index into the table. It is built from the single-qudit syndromes of
+error_mapping. For d = 2 the code is perfect and these cover every syndrome. For
+d > 2 there are only 5(d^2 - 1) single-qudit errors for d^4 - 1 syndromes, so
+the other syndromes get a weight-2 correction, found from sums of two
+single-qudit syndromes (the syndrome of a product of Paulis is the sum of their
+syndromes mod d).
+
+Multi-round detector vectors use the xor_check_blocks_with_prev convention:
+every round is a block of 4(d-1) bits, bit 4k + i is set when ancilla i measured
+k + 1, and rejected rounds are all zero. The last non-zero block is decoded.
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+
+class LookupDecoder:
+
+    """Syndrome -> correction table, with corrections as rows of integer Pauli codes (see Pauli.py).
+    """
+
+    def __init__(self, d: int, mapping) -> None:
+        # mapping: the output of error_mapping(d), a list of {'Error': code, 'Result': [a, b, c, d]}
+        self._d = d
+        self._powers = d ** np.arange(4)
+        codes = np.array([item['Error'] for item in mapping], dtype=np.int64)
+        syndromes = np.array([item['Result'] for item in mapping], dtype=np.int64)
+        qudits = codes // (d * d)
+        keys = syndromes @ self._powers
+
+        table = np.zeros((d**4, 2), dtype=np.int64)
+        weight = np.full(d**4, -1, dtype=np.int64)
+        weight[0] = 0
+        # Single-qudit errors first, in the order of the mapping
+        nontrivial = np.flatnonzero(codes % (d * d) != 0)
+        for i in nontrivial[::-1]:
+            table[keys[i]] = (codes[i], 0)
+            weight[keys[i]] = 1
+        # Pairs of errors on different qudits for the syndromes that are left
+        first, second = np.meshgrid(nontrivial, nontrivial, indexing='ij')
+        pairs = (qudits[first] < qudits[second])
+        first, second = first[pairs], second[pairs]
+        pair_keys = ((syndromes[first] + syndromes[second]) % d) @ self._powers
+        missing = weight[pair_keys] < 0
+        pair_keys, index = np.unique(pair_keys[missing], return_index=True)
+        table[pair_keys, 0] = codes[first[missing][index]]
+        table[pair_keys, 1] = codes[second[missing][index]]
+        weight[pair_keys] = 2
+        self.table = table
+        self.weight = weight
+
+    def decode_syndromes(self, syndromes):
+        """Corrections for a (shots, 4) array of ancilla outcomes, shape (shots, 2); code 0 is the identity."""
+        syndromes = np.asarray(syndromes, dtype=np.int64) % self._d
+        return self.table[syndromes @ self._powers]
+
+    def syndromes_from_detectors(self, detectors):
+        """The last non-zero round of a (shots, cycles*4(d-1)) detector matrix as (shots, 4) ancilla outcomes."""
+        d = self._d
+        detectors = np.atleast_2d(np.asarray(detectors, dtype=np.int64))
+        blocks = detectors.reshape(len(detectors), -1, d - 1, 4)
+        rounds = np.tensordot(blocks, np.arange(1, d), axes=([2], [0]))
+        nonzero = np.any(rounds != 0, axis=2)
+        last = rounds.shape[1] - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+        return rounds[np.arange(len(rounds)), last]
+
+    def decode(self, detectors):
+        """Corrections for a batch of detector vectors, shape (shots, 2)."""
+        return self.decode_syndromes(self.syndromes_from_detectors(detectors))
+
+    def errors(self, correction):
+        # A correction row as a list of Pauli codes for C_circ, without the identity padding
+        return [int(code) for code in correction if code % (self._d * self._d) != 0]
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:27:09 2026
+
+Vectorized matching graph
+
+The matching graph of the 5-qudit code repeats the same edges every cycle: a
+boundary edge for each of the 4(d-1) detectors of a round, the two-detector
+edges of the other single-qudit errors, and a time edge between the same
+detector in consecutive rounds (fault id len(id_list) + 1, the measurement
+error). MatchingGraph builds the space-time check matrix, the fault matrix and
+the index of the weight of every edge for all cycles at once with NumPy, and
+the pymatching graph with one from_check_matrix call.
+
+The structure does not depend on p. structure caches it per (d, cycles,
+id_list), and reweight builds the graph for a new list of weights from the
+cached arrays, so a p-sweep never redoes the per-edge work. pymatching has no
+bulk update of the weights of an existing graph, so reweight returns a new
+pm.Matching.
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+
+_structures = {}
+
+class MatchingGraph:
+
+    """Check matrix, fault matrix and weight indices of the matching graph for a number of cycles.
+    """
+
+    def __init__(self, d: int, cycles: int, id_list) -> None:
+        import scipy.sparse
+        npc = 4 * (d - 1)
+        errors = id_list[:2 * 5 * (d - 1)]
+        first = np.array([item['Node'][0] for item in errors])
+        second = np.array([item['Node'][1] if len(item['Node']) > 1 else -1 for item in errors])
+        index = np.array([item['Index'] for item in errors])
+
+        # Space edges of every cycle, offset by the detectors of the earlier cycles
+        offsets = (np.arange(cycles) * npc)[:, None]
+        u = (first + offsets).reshape(-1)
+        v = np.where(second < 0, -1, second + offsets).reshape(-1)
+        faults = np.tile(index, cycles)
+        weight_index = np.tile(index, cycles)
+        # Time edges between the same detector in consecutive cycles
+        time = np.arange((cycles - 1) * npc)
+        u = np.concatenate([u, time])
+        v = np.concatenate([v, time + npc])
+        faults = np.concatenate([faults, np.full(len(time), len(id_list) + 1)])
+        weight_index = np.concatenate([weight_index, np.full(len(time), -1)])
+
+        edges = np.arange(len(u))
+        boundary = v < 0
+        rows = np.concatenate([u, v[~boundary]])
+        cols = np.concatenate([edges, edges[~boundary]])
+        self.check_matrix = scipy.sparse.csc_matrix((np.ones(len(rows), dtype=np.uint8), (rows, cols)), shape=(cycles * npc, len(u)))
+        self.faults_matrix = scipy.sparse.csc_matrix((np.ones(len(u), dtype=np.uint8), (faults, edges)), shape=(faults.max() + 1, len(u)))
+        self.weight_index = weight_index
+        self.d = d
+        self.cycles = cycles
+
+    def edge_weights(self, weights):
+        # weights as made by Dep_weights_MWPM: one per fault index, the last for the time edges
+        return np.asarray(weights, dtype=float)[self.weight_index]
+
+    def reweight(self, weights):
+        """The pymatching graph with these weights, built in one call from the cached arrays."""
+        import pymatching as pm
+        return pm.Matching.from_check_matrix(self.check_matrix, weights=self.edge_weights(weights), faults_matrix=self.faults_matrix, use_virtual_boundary_node=True)
+
+def structure(d, cycles, id_list):
+    """The cached MatchingGraph of this dimension, number of cycles and fault list."""
+    key = (d, cycles, tuple((item['Index'], tuple(item['Node'])) for item in id_list))
+    if key not in _structures:
+        _structures[key] = MatchingGraph(d, cycles, id_list)
+    return _structures[key]
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:10:48 2026
+
+Out-of-core state vector
+
+The state of n qudits is stored as an np.memmap of shape (d,)*n in a file on
+local disk, so d = 7 runs (7^10 amplitudes, 2.3 GB in complex64) do not need
+to fit in RAM. A gate is applied block by block: every block fixes the leading
+axes the gate does not touch, is read once, updated in memory and written back,
+so every gate reads and writes the file once. When all fixed axes come before
+the gate's axes, a block is one contiguous range of the file and the blocks are
+visited in file order: one sequential pass. A gate on a leading axis (e.g.
+qudit 0) has fixed axes after its own, and then every block is d^k strided runs
+(k the number of gate axes before the last fixed one), spread over the file.
+Fixing the leading axes still gives the longest runs for the block size.
+Measurements need one read pass for the probabilities and one read/write pass
+for the collapse.
+
+simulate runs a cirq circuit of the qudit gates and channels of this package on
+such a state, with the measurement results in the same format as cirq.
+
+@author: James Keppens
+"""
+#Imports
+import os
+import tempfile
+import itertools
+import numpy as np
+import GateCore
+
+class MemmapState:
+
+    """A state vector of n qudits of dimension d in a memory-mapped file, initialized to |0...0〉.
+    """
+
+    def __init__(self, n: int, d: int, folder=None, name: str = 'state', dtype=np.complex64, block_bytes: int = 1 << 26) -> None:
+        if folder is None:
+            folder = tempfile.mkdtemp(prefix='qudit_state_')
+        os.makedirs(folder, exist_ok=True)
+        self.n = n
+        self.d = d
+        self.path = os.path.join(folder, f'{name}.dat')
+        self.block_bytes = block_bytes
+        self.tensor = np.memmap(self.path, dtype=dtype, mode='w+', shape=(d,) * n)
+        self.tensor[(0,) * n] = 1
+
+    def blocks(self, axes=()):
+        """Index tuples of the blocks, in file order, that keep the given axes whole."""
+        fixed = []
+        size = self.tensor.nbytes
+        for axis in range(self.n):
+            if size <= self.block_bytes:
+                break
+            if axis not in axes:
+                fixed.append(axis)
+                size //= self.d
+        blocks = []
+        for values in itertools.product(range(self.d), repeat=len(fixed)):
+            index = [slice(None)] * self.n
+            for axis, value in zip(fixed, values):
+                index[axis] = slice(value, value + 1)
+            blocks.append(tuple(index))
+        return blocks
+
+    def apply_monomial(self, axes, perm, phases):
+        shape = (self.d,) * len(axes)
+        for block in self.blocks(axes):
+            part = np.array(self.tensor[block])
+            self.tensor[block] = GateCore.apply_monomial(part, np.empty_like(part), axes, shape, perm, phases)
+
+    def apply_matrix(self, axes, matrix):
+        k = len(axes)
+        matrix = np.asarray(matrix, dtype=self.tensor.dtype).reshape((self.d,) * (2 * k))
+        for block in self.blocks(axes):
+            part = np.array(self.tensor[block])
+            result = np.tensordot(matrix, part, axes=(list(range(k, 2 * k)), list(axes)))
+            self.tensor[block] = np.moveaxis(result, list(range(k)), list(axes))
+
+    def apply_gate(self, gate, axes, inverse=False):
+        import cirq
+        monomial = gate._monomial_() if hasattr(gate, '_monomial_') else None
+        if monomial is not None:
+            if inverse:
+                monomial = GateCore.monomial_inverse(*monomial)
+            self.apply_monomial(axes, *monomial)
+        else:
+            matrix = cirq.unitary(gate)
+            self.apply_matrix(axes, np.conjugate(matrix).T if inverse else matrix)
+
+    def probabilities(self, axis):
+        p = np.zeros(self.d)
+        others = tuple(a for a in range(self.n) if a != axis)
+        for block in self.blocks((axis,)):
+            p += np.sum(np.abs(self.tensor[block])**2, axis=others)
+        return p
+
+    def measure(self, axis, prng=np.random, reset=False):
+        """Measure one qudit, collapse the state and optionally reset the qudit to |0〉."""
+        p = self.probabilities(axis)
+        p = p / np.sum(p)
+        outcome = prng.choice(range(self.d), p=p)
+        scale = 1 / np.sqrt(p[outcome])
+        target = 0 if reset else outcome
+        for block in self.blocks((axis,)):
+            part = np.array(self.tensor[block])
+            kept = np.take(part, [outcome], axis=axis) * scale
+            part[...] = 0
+            part[GateCore.slice_index(self.n, (axis,), (target,))] = kept
+            self.tensor[block] = part
+        return outcome
+
+    def inner(self, other):
+        """〈self|other〉, with other a MemmapState or an array of d^n amplitudes."""
+        other = other.tensor if isinstance(other, MemmapState) else np.asarray(other).reshape(self.tensor.shape)
+        total = 0
+        for block in self.blocks():
+            total += np.vdot(self.tensor[block], other[block])
+        return total
+
+    def matches(self, other, atol=1e-5):
+        # Equal up to a global phase, both states being normalized
+        return abs(abs(self.inner(other)) - 1) < atol
+
+    def to_array(self):
+        return np.array(self.tensor).reshape(-1)
+
+    def copy(self, name):
+        """A new state in the same folder with the same amplitudes, copied block by block (e.g. from a checkpoint)."""
+        other = MemmapState(self.n, self.d, folder=os.path.dirname(self.path), name=name, dtype=self.tensor.dtype, block_bytes=self.block_bytes)
+        for block in self.blocks():
+            other.tensor[block] = self.tensor[block]
+        return other
+
+    def close(self, delete=True):
+        self.tensor.flush()
+        del self.tensor
+        if delete and os.path.exists(self.path):
+            os.remove(self.path)
+
+def _act(state, op, index, prng, inverse=False):
+    import cirq
+    axes = tuple(index[q] for q in op.qubits)
+    gate = op.gate
+    if cirq.is_measurement(op):
+        return state.measure(axes[0], prng)
+    if isinstance(gate, cirq.ResetChannel):
+        state.measure(axes[0], prng, reset=True)
+    elif cirq.has_unitary(gate):
+        state.apply_gate(gate, axes, inverse)
+    elif hasattr(gate, '_paulis'):
+        # Pauli channels: sample like cirq and apply the Pauli as a monomial
+        i = prng.choice(range(len(gate._probabilities)), p=gate._probabilities)
+        for axis, c in zip(axes, np.atleast_1d(gate._paulis[i])):
+            if c != 0:
+                state.apply_monomial((axis,), *GateCore.pauli_monomial(state.d, c // state.d, c % state.d))
+    elif cirq.has_mixture(gate):
+        probabilities, unitaries = zip(*cirq.mixture(gate))
+        state.apply_matrix(axes, unitaries[prng.choice(range(len(unitaries)), p=probabilities)])
+    else:
+        raise ValueError(f"Cannot simulate {op} on a memory-mapped state.")
+    return None
+
+def simulate(circuit, qudits, folder=None, name='state', prng=np.random, state=None, **kwargs):
+    """Run a circuit on a MemmapState (a new one on |0...0〉 if state is None).
+
+    Returns the measurements, as {key: np.array([outcome])} like cirq's simulate, and the state.
+    """
+    import cirq
+    if state is None:
+        state = MemmapState(len(qudits), qudits[0].dimension, folder=folder, name=name, **kwargs)
+    index = {q: i for i, q in enumerate(qudits)}
+    measurements = {}
+    for op in circuit.all_operations():
+        outcome = _act(state, op, index, prng)
+        if outcome is not None:
+            measurements[cirq.measurement_key_name(op)] = np.array([outcome])
+    return measurements, state
+
+def apply_circuit(state, circuit, qudits, inverse=False):
+    """Apply the unitary gates of a circuit (e.g. a correction), or undo them with inverse=True."""
+    index = {q: i for i, q in enumerate(qudits)}
+    ops = list(circuit.all_operations())
+    for op in (reversed(ops) if inverse else ops):
+        _act(state, op, index, None, inverse)
+
+def corrects_to(state, correction, qudits, reference, atol=1e-5):
+    """Apply a correction circuit, compare with the reference state and undo the correction again.
+
+    Undoing the Pauli correction is as cheap as applying it and avoids copying the state file.
+    """
+    apply_circuit(state, correction, qudits)
+    equal = bool(state.matches(reference, atol))
+    apply_circuit(state, correction, qudits, inverse=True)
+    return equal
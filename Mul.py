@@ -8,122 +8,178 @@ Qudit X2 gate
 Based on https://quantumai.google/cirq/build/qudits
 """
 #Imports
-import cirq
 import numpy as np
+import GateCore
+import Kernels
+
+def _gates():
+    import cirq
+
+    @cirq.value_equality(manual_cls=True)
+    class M(cirq.Gate):
+        
+        
+        def __init__(self, d: int, g: int) -> None:
+            self._d = d
+            self._g = g
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, self._g % self._d
+
+        def _value_equality_values_cls_(self):
+            return M
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            try:
+                return M(self._d, pow(self._g, exponent, self._d))
+            except ValueError:
+                return NotImplemented
+
+        def create_qudit_multiplication_gate(self, d, g):
+            return GateCore.multiplication_matrix(d, g)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(self.create_qudit_multiplication_gate(self._d,self._g),dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.permutation_monomial(GateCore.multiplication_permutation(self._d, self._g))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return f'[x{self._g}]'
+
+    @cirq.value_equality(manual_cls=True)
+    class Minv(cirq.Gate):
+        
+        
+        def __init__(self, d: int, g: int) -> None:
+            self._d = d
+            self._g = g
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, pow(self._g, -1, self._d)
+
+        def _value_equality_values_cls_(self):
+            return M
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return M(self._d, pow(self._g, -exponent, self._d))
+
+        def create_qudit_multiplication_gate(self, d, g):
+            return GateCore.multiplication_matrix(d, g)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.linalg.inv(self.create_qudit_multiplication_gate(self._d,self._g)),dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.monomial_inverse(*GateCore.permutation_monomial(GateCore.multiplication_permutation(self._d, self._g)))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
 
-class M(cirq.Gate):
-    
-    
-    def __init__(self, d: int, g: int) -> None:
-        self._d = d
-        self._g = g
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_qudit_multiplication_gate(self, d, g):
-        # Check if g is within the valid range
-        if g < 1 or g >= d:
-            raise ValueError("Invalid value for 'g'. It must be in the range (1, d-1).")
-    
-        # Create the qudit multiplication gate matrix
-        multiplication_gate_matrix = np.zeros((d, d), dtype=np.complex128)
-    
-        for i in range(d):
-            multiplication_gate_matrix[(i * g) % d, i] = 1
-    
-        return multiplication_gate_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(self.create_qudit_multiplication_gate(self._d,self._g),dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return f'[x{self._g}]'
-
-class Minv(cirq.Gate):
-    
-    
-    def __init__(self, d: int, g: int) -> None:
-        self._d = d
-        self._g = g
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_qudit_multiplication_gate(self, d, g):
-        # Check if g is within the valid range
-        if g < 1 or g >= d:
-            raise ValueError("Invalid value for 'g'. It must be in the range (1, d-1).")
-    
-        # Create the qudit multiplication gate matrix
-        multiplication_gate_matrix = np.zeros((d, d), dtype=np.complex128)
-    
-        for i in range(d):
-            multiplication_gate_matrix[(i * g) % d, i] = 1
-    
-        return multiplication_gate_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.linalg.inv(self.create_qudit_multiplication_gate(self._d,self._g)),dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return f'[x{self._g}-]'
-
-class Mdag(cirq.Gate):
-    
-    
-    def __init__(self, d: int, g: int) -> None:
-        self._d = d
-        self._g = g
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_qudit_multiplication_gate(self, d, g):
-        # Check if g is within the valid range
-        if g < 1 or g >= d:
-            raise ValueError("Invalid value for 'g'. It must be in the range (1, d-1).")
-    
-        # Create the qudit multiplication gate matrix
-        multiplication_gate_matrix = np.zeros((d, d), dtype=np.complex128)
-    
-        for i in range(d):
-            multiplication_gate_matrix[(i * g) % d, i] = 1
-    
-        return multiplication_gate_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.conjugate(self.create_qudit_multiplication_gate(self._d,self._g)).T,dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return f'[x{self._g}-]'
\ No newline at end of file
+        def _circuit_diagram_info_(self, args):
+            return f'[x{self._g}-]'
+
+    @cirq.value_equality(manual_cls=True)
+    class Mdag(cirq.Gate):
+        
+        
+        def __init__(self, d: int, g: int) -> None:
+            self._d = d
+            self._g = g
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, pow(self._g, -1, self._d)
+
+        def _value_equality_values_cls_(self):
+            return M
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return M(self._d, pow(self._g, -exponent, self._d))
+
+        def create_qudit_multiplication_gate(self, d, g):
+            return GateCore.multiplication_matrix(d, g)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.conjugate(self.create_qudit_multiplication_gate(self._d,self._g)).T,dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.monomial_inverse(*GateCore.permutation_monomial(GateCore.multiplication_permutation(self._d, self._g)))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return f'[x{self._g}-]'
+
+    return M, Minv, Mdag
+
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:06:22 2026
+
+Circuit optimizer for the qudit circuits
+
+Walks over every qudit and multiplies runs of single-qudit gates that are not
+separated by noise, measurements, resets or two-qudit gates into one gate.
+Runs that multiply to the identity (up to a global phase), such as H followed by
+Hdag, are removed. Runs that multiply to a permutation + phase matrix (e.g.
+several diagonal Phase gates) become one monomial gate, other runs one matrix gate.
+
+Noise channels, measurements, resets and two-qudit gates stay in the moment they
+were in. A fused gate takes the place of the last gate of its run. Moments that
+end up empty are dropped.
+
+@author: James Keppens
+"""
+#Imports
+import sys
+import numpy as np
+import GateCore
+import Kernels
+
+def _gates():
+    import cirq
+
+    class Fused(cirq.Gate):
+
+        """A single-qudit gate that is the product of a run of gates.
+        """
+
+        def __init__(self, d: int, matrix, label: str) -> None:
+            self._d = d
+            self._matrix = np.asarray(matrix, dtype=np.complex128)
+            self._label = label
+            self._monomial = as_monomial(self._matrix)
+
+        def _qid_shape_(self):
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True
+
+        def _unitary_(self):
+            return self._matrix
+
+        def _monomial_(self):
+            return self._monomial
+
+        def _apply_unitary_(self, args):
+            if self._monomial is None:
+                return NotImplemented
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial)
+
+        def _circuit_diagram_info_(self, args):
+            return f'[{self._label}]'
+
+    return (Fused,)
+
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
+
+def as_monomial(matrix, atol=1e-8):
+    """Return (perm, phases) if every column of matrix has one non-zero entry, else None."""
+    mask = np.abs(matrix) > atol
+    if not np.all(mask.sum(axis=0) == 1):
+        return None
+    perm = np.argmax(mask, axis=0)
+    if len(np.unique(perm)) != len(perm):
+        return None
+    return perm, matrix[perm, np.arange(len(perm))]
+
+def is_identity(matrix, atol=1e-6):
+    # Identity up to a global phase
+    phase = matrix[0, 0]
+    return abs(abs(phase) - 1) < atol and np.allclose(matrix, phase * np.identity(len(matrix)), atol=atol)
+
+def _fusible(op):
+    import cirq
+    return len(op.qubits) == 1 and not cirq.is_measurement(op) and cirq.has_unitary(op)
+
+def _label(op):
+    import cirq
+    info = cirq.circuit_diagram_info(op, default=None)
+    if info is None:
+        return '?'
+    return info.wire_symbols[0].strip('[]')
+
+def optimize(circuit):
+    """Fuse single-qudit gate runs in a circuit.
+
+    Returns the optimized circuit and the number of gates removed.
+    """
+    import cirq
+    fused_gate = getattr(sys.modules[__name__], 'Fused')
+    moments = [[] for _ in circuit]
+    pending = {}
+    removed = 0
+
+    def flush(qudit):
+        nonlocal removed
+        run = pending.pop(qudit, [])
+        if len(run) == 1:
+            moments[run[0][0]].append(run[0][1])
+            return
+        if not run:
+            return
+        matrix = np.identity(qudit.dimension, dtype=np.complex128)
+        for _, op in run:
+            matrix = cirq.unitary(op).astype(np.complex128) @ matrix
+        if is_identity(matrix):
+            removed += len(run)
+            return
+        label = '·'.join(_label(op) for _, op in reversed(run))
+        moments[run[-1][0]].append(fused_gate(qudit.dimension, matrix, label).on(qudit))
+        removed += len(run) - 1
+
+    for m, moment in enumerate(circuit):
+        for op in moment.operations:
+            if _fusible(op):
+                pending.setdefault(op.qubits[0], []).append((m, op))
+            else:
+                for qudit in op.qubits:
+                    flush(qudit)
+                moments[m].append(op)
+    for qudit in list(pending):
+        flush(qudit)
+
+    optimized = cirq.Circuit()
+    for ops in moments:
+        if ops:
+            optimized.append(cirq.Moment(ops))
+    return optimized, removed
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:25:51 2026
+
+Integer encoding of qudit Pauli operators
+
+A single-qudit Pauli X^x Z^z acting on qudit q of dimension d is stored as the
+integer code = (q*d + x)*d + z. Code 0 (or any code with x = z = 0) is the
+identity. X^x is GateCore.shift_matrix(d, x) and Z^z is
+GateCore.roots_of_unity_matrix(d, z), the same convention as the Y gate, so
+X^x Z^z|k〉 = w^(z*k)|k - x〉. Multi-qudit Paulis are arrays of codes.
+
+The old string labels 'X{q}{x}', 'Z{q}{z}' and 'Y{q}{x}{z}' only work for
+single digit indices, from_label and to_label convert between both for
+d < 10 (e.g. for the hook_map pickles).
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+import GateCore
+
+def encode(qudit, x, z, d):
+    # Works on ints and on NumPy arrays
+    return (qudit * d + x % d) * d + z % d
+
+def decode(code, d):
+    # Returns (qudit, x, z)
+    qx, z = divmod(code, d)
+    q, x = divmod(qx, d)
+    return q, x, z
+
+def local(code, d):
+    # The single-qudit part x*d + z of a code
+    return code % (d * d)
+
+def inverse(code, d):
+    # X^x Z^z is inverted (up to a phase) by X^-x Z^-z
+    q, x, z = decode(code, d)
+    return encode(q, -x, -z, d)
+
+def is_identity(code, d):
+    return local(code, d) == 0
+
+def from_label(label, d):
+    if label in ('', 'I'):
+        return 0
+    letter = label[0]
+    q = int(label[1])
+    if letter == 'X':
+        return encode(q, int(label[2]), 0, d)
+    if letter == 'Z':
+        return encode(q, 0, int(label[2]), d)
+    if letter == 'Y':
+        return encode(q, int(label[2]), int(label[3]), d)
+    raise ValueError(f"Unexpected letter '{letter}' in label '{label}'.")
+
+def to_label(code, d):
+    q, x, z = decode(code, d)
+    if x == 0 and z == 0:
+        return ''
+    if z == 0:
+        return f'X{q}{x}'
+    if x == 0:
+        return f'Z{q}{z}'
+    return f'Y{q}{x}{z}'
+
+def ordered_pauli_list(d, n=5):
+    # Identity, then all X errors, all Z errors and all Y errors per qudit
+    result = [0]
+    result += [encode(a, b, 0, d) for a in range(n) for b in range(1, d)]
+    result += [encode(a, 0, b, d) for a in range(n) for b in range(1, d)]
+    result += [encode(a, b, c, d) for a in range(n) for b in range(1, d) for c in range(1, d)]
+    return result
+
+#Single and two-qudit depolarizing tables (codes without qudit, x*d + z)
+def single_qudit_paulis(d):
+    # Order I, X1, Z1, Y11, ..., Y1(d-1), X2, Z2, Y21, ... as in the original channel tables
+    paulis = [0]
+    for j in range(1, d):
+        paulis.append(j * d)
+        paulis.append(j)
+        for k in range(1, d):
+            paulis.append(j * d + k)
+    return np.array(paulis, dtype=np.int64)
+
+def two_qudit_paulis(d, full: bool = False):
+    """The d^4 rows of the two-qudit depolarizing channel (local code on qudit 0, local code on qudit 1), identity first.
+
+    By default the rows are those of the original string-parsing channel, like depolarizeTwoQudit: a pair whose
+    qudit-1 factor comes first in the element order was turned into the identity (only for d >= 3).
+    With full=True they are all d^4 two-qudit Paulis.
+    """
+    # Single-qudit elements in the order X_j, Z_j, Y_jk for j = 1..d-1, each on qudit 0 and 1
+    elements = []
+    for j in range(1, d):
+        for i in range(0, 2):
+            elements.append((i, j * d))
+            elements.append((i, j))
+            for k in range(1, d):
+                elements.append((i, j * d + k))
+    rows = [(0, 0)]
+    for i, c in elements:
+        rows.append((c, 0) if i == 0 else (0, c))
+    for a in range(len(elements)):
+        for b in range(a + 1, len(elements)):
+            (ia, ca), (ib, cb) = elements[a], elements[b]
+            if ia != ib:
+                if ia == 0:
+                    rows.append((ca, cb))
+                else:
+                    rows.append((cb, ca) if full else (0, 0))
+    return np.array(rows, dtype=np.int64)
+
+#Matrices
+def matrix(x, z, d):
+    return GateCore.shift_matrix(d, x % d) @ GateCore.roots_of_unity_matrix(d, z % d)
+
+def local_matrix(c, d):
+    return matrix(c // d, c % d, d)
+
+def multi_matrix(xs, zs, d):
+    result = np.identity(1)
+    for x, z in zip(xs, zs):
+        result = np.kron(result, matrix(x, z, d))
+    return result
+
+#Monomials (see GateCore): X^x Z^z|k〉 = w^(z*k)|k - x〉
+def local_monomial(c, d):
+    return GateCore.pauli_monomial(d, c // d, c % d)
+
+def multi_monomial(cs, d):
+    cs = np.atleast_1d(cs)
+    result = local_monomial(cs[0], d)
+    for c in cs[1:]:
+        result = GateCore.monomial_kron(result, local_monomial(c, d))
+    return result
+
+def sparse_mixture(probabilities, paulis, d):
+    # The mixture of a Pauli channel with scipy.sparse matrices, d^k non-zeros each
+    return tuple((p, GateCore.monomial_to_sparse(*multi_monomial(cs, d))) for p, cs in zip(probabilities, paulis))
+
+def act_on_mixture(sim_state, qudits, probabilities, paulis, d):
+    """Sample one Pauli of a channel and apply it to a cirq state vector, for the channel's _act_on_.
+
+    The Pauli is applied as a monomial, so the d^k x d^k Kraus matrices are never built.
+    The sample is drawn like cirq's own mixture simulation. Returns NotImplemented for
+    other simulation states, which then fall back on _mixture_.
+    """
+    import cirq
+    import Y
+    if not isinstance(sim_state, cirq.StateVectorSimulationState):
+        return NotImplemented
+    index = sim_state.prng.choice(range(len(probabilities)), p=probabilities)
+    for qudit, c in zip(qudits, np.atleast_1d(paulis[index])):
+        if c != 0:
+            cirq.act_on(Y.Y(d, c // d, c % d), sim_state, [qudit])
+    return True
+
+def pauli_of(u, d, k=1, atol=1e-6):
+    """Return (xs, zs) if the d^k x d^k matrix u is a Pauli up to a phase, else None."""
+    u = np.asarray(u)
+    col0 = u[:, 0]
+    r = int(np.argmax(np.abs(col0)))
+    digits = np.array(np.unravel_index(r, (d,) * k))
+    xs = (-digits) % d
+    zs = np.zeros(k, dtype=np.int64)
+    for j in range(k):
+        e = np.zeros(k, dtype=np.int64)
+        e[j] = 1
+        col = u[:, np.ravel_multi_index(e, (d,) * k)]
+        rj = int(np.argmax(np.abs(col)))
+        angle = np.angle(col[rj] / col0[r])
+        zs[j] = int(np.round(angle * d / (2 * np.pi))) % d
+    p = multi_matrix(xs, zs, d)
+    phase = col0[r] / p[r, 0]
+    if not np.allclose(u, phase * p, atol=atol):
+        return None
+    return xs, zs
+
+def clifford_action(u, d, k=1):
+    """Symplectic action of a Clifford unitary u on k qudits.
+
+    Returns the 2k x 2k integer matrix S with u P(v) u^† ∝ P(S v mod d), where
+    v = (x_1, ..., x_k, z_1, ..., z_k).
+    """
+    u = np.asarray(u)
+    udag = np.conjugate(u).T
+    action = np.zeros((2 * k, 2 * k), dtype=np.int64)
+    for g in range(2 * k):
+        xs = np.zeros(k, dtype=np.int64)
+        zs = np.zeros(k, dtype=np.int64)
+        if g < k:
+            xs[g] = 1
+        else:
+            zs[g - k] = 1
+        image = pauli_of(u @ multi_matrix(xs, zs, d) @ udag, d, k)
+        if image is None:
+            raise ValueError("The unitary is not a Clifford gate.")
+        action[:k, g] = image[0]
+        action[k:, g] = image[1]
+    return action
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 15:40:08 2026
+
+Pauli frame propagation through the qudit Clifford circuits
+
+Instead of simulating the state vector, a Pauli error is pushed through the
+Clifford gates of a circuit as exponent vectors (x, z) per qudit. This gives the
+measurement outcomes caused by the error at a cost that does not depend on d^n,
+so syndrome tables can be built for any dimension d.
+
+The reference circuit is the circuit without its Pauli gates and noise channels,
+whose measurements are assumed to give 0 (true for the parity checks on an
+encoded state). Pauli gates (Shift, Phase, Y, ...) in the circuit are added to
+the frame, noise channels are skipped unless a fault is injected there.
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+import Pauli
+
+_actions = {}
+
+def _gate_key(gate):
+    items = []
+    for name, value in sorted(vars(gate).items()):
+        if isinstance(value, (int, float, str, np.integer, np.floating)):
+            items.append((name, value))
+        else:
+            return None
+    return (type(gate).__module__, type(gate).__qualname__, tuple(items))
+
+def gate_action(gate, d):
+    """Return ('pauli', xs, zs) for Pauli gates and ('clifford', S) for other Clifford gates."""
+    import cirq
+    key = _gate_key(gate)
+    if key is not None and key in _actions:
+        return _actions[key]
+    k = cirq.num_qubits(gate)
+    u = cirq.unitary(gate)
+    pauli = Pauli.pauli_of(u, d, k)
+    if pauli is not None:
+        action = ('pauli', pauli[0], pauli[1])
+    else:
+        action = ('clifford', Pauli.clifford_action(u, d, k))
+    if key is not None:
+        _actions[key] = action
+    return action
+
+def propagate(circuit, d, frames=1, injections=None, qudits=None):
+    """Propagate Pauli frames through a circuit.
+
+    frames is the number of frames propagated side by side. injections maps
+    (moment index, qudit indices of a noise op) to an int array of shape
+    (frames, k, 2) with the (x, z) exponents of the fault inserted at that noise op.
+    Returns the measurement outcomes per key, shape (frames,), and the final
+    frames, shape (frames, n, 2).
+    """
+    import cirq
+    if qudits is None:
+        qudits = sorted(circuit.all_qubits())
+    index = {q: i for i, q in enumerate(qudits)}
+    frame = np.zeros((frames, len(qudits), 2), dtype=np.int64)
+    measurements = {}
+    for m, moment in enumerate(circuit):
+        for op in moment.operations:
+            idx = [index[q] for q in op.qubits]
+            gate = op.gate
+            if cirq.is_measurement(op):
+                outcome = (-frame[:, idx, 0]) % d
+                measurements[cirq.measurement_key_name(op)] = outcome[:, 0] if len(idx) == 1 else outcome
+            elif isinstance(gate, cirq.ResetChannel):
+                frame[:, idx, :] = 0
+            elif cirq.has_unitary(gate):
+                action = gate_action(gate, d)
+                if action[0] == 'pauli':
+                    frame[:, idx, 0] = (frame[:, idx, 0] + action[1]) % d
+                    frame[:, idx, 1] = (frame[:, idx, 1] + action[2]) % d
+                else:
+                    k = len(idx)
+                    v = np.concatenate([frame[:, idx, 0], frame[:, idx, 1]], axis=1)
+                    v = (v @ action[1].T) % d
+                    frame[:, idx, 0] = v[:, :k]
+                    frame[:, idx, 1] = v[:, k:]
+            elif cirq.has_mixture(gate):
+                if injections is not None and (m, tuple(idx)) in injections:
+                    fault = injections[(m, tuple(idx))]
+                    frame[:, idx, :] = (frame[:, idx, :] + fault) % d
+            else:
+                raise ValueError(f"Cannot propagate a Pauli frame through {op}.")
+    return measurements, frame
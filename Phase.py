@@ -8,151 +8,227 @@ Qudit Phase gate
 Based on https://quantumai.google/cirq/build/qudits
 """
 #Imports
-import cirq
 import numpy as np
+import GateCore
+import Kernels
 
-class Phase(cirq.Gate):
-    
-    def __init__(self, d: int, b: int) -> None:
-        self._d = d
-        self._b = b
-    
-    """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-    
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_roots_of_unity_matrix(self, d, b):
-        if d < 1:
-            raise ValueError("Dimension 'd' must be at least 1.")
-        if b > d:
-            raise ValueError("b cannot be larger than the Dimension 'd'")
-        # Compute the d squared roots of unity
-        roots = [np.exp(2j * np.pi * ((k*b)%d) / d) for k in range(d)]
+def _gates():
+    import cirq
+
+    @cirq.value_equality(manual_cls=True)
+    class Phase(cirq.Gate):
+        
+        def __init__(self, d: int, b: int) -> None:
+            self._d = d
+            self._b = b
+        
+        """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+        
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, self._b % self._d
+
+        def _value_equality_values_cls_(self):
+            return Phase
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return Phase(self._d, (self._b * exponent) % self._d)
+
+        def create_roots_of_unity_matrix(self, d, b):
+            return GateCore.roots_of_unity_matrix(d, b)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(self.create_roots_of_unity_matrix(self._d,self._b),dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.diagonal_monomial(GateCore.roots_of_unity_diagonal(self._d, self._b))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return f'[Z({self._b})]'
+
+    @cirq.value_equality(manual_cls=True)
+    class Phasedag(cirq.Gate):
+        
+        def __init__(self, d: int, b: int) -> None:
+            self._d = d
+            self._b = b
         
-        # Create a diagonal matrix with the roots of unity
-        roots_matrix = np.diag(roots)
+        """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+        
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, -self._b % self._d
+
+        def _value_equality_values_cls_(self):
+            return Phase
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return Phase(self._d, (-self._b * exponent) % self._d)
+
+        def create_roots_of_unity_matrix(self, d, b):
+            return GateCore.roots_of_unity_matrix(d, b)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.conjugate(self.create_roots_of_unity_matrix(self._d,self._b)).T,dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.diagonal_monomial(np.conjugate(GateCore.roots_of_unity_diagonal(self._d, self._b)))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return f'[Z*({self._b})]'
         
-        return roots_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(self.create_roots_of_unity_matrix(self._d,self._b),dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return f'[Z({self._b})]'
-
-class Phasedag(cirq.Gate):
-    
-    def __init__(self, d: int, b: int) -> None:
-        self._d = d
-        self._b = b
-    
-    """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-    
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_roots_of_unity_matrix(self, d, b):
-        if d < 1:
-            raise ValueError("Dimension 'd' must be at least 1.")
-        if b > d:
-            raise ValueError("b cannot be larger than the Dimension 'd'")
-        # Compute the d squared roots of unity
-        roots = [np.exp(2j * np.pi * ((k*b)%d) / d) for k in range(d)]
+
+    @cirq.value_equality(manual_cls=True)
+    class Pg(cirq.Gate):
         
-        # Create a diagonal matrix with the roots of unity
-        roots_matrix = np.diag(roots)
+        def __init__(self, d: int, g:int) -> None:
+            self._d = d
+            self._g = g
         
-        return roots_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.conjugate(self.create_roots_of_unity_matrix(self._d,self._b)).T,dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return f'[Z*({self._b})]'
-    
-
-class Pg(cirq.Gate):
-    
-    def __init__(self, d: int, g:int) -> None:
-        self._d = d
-        self._g = g
-    
-    """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-    
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_diagonal_matrix(self, d, g):
-        # Calculate the d'th root of unity
-        w = np.exp(2j * np.pi / d)
-    
-        # Create the diagonal matrix
-        diagonal_matrix = np.diag([w**(i**2 * g / 2) for i in range(d)])
-    
-        return diagonal_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(self.create_diagonal_matrix(self._d, self._g),dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return '[Pγ]'
-
-class Pgdag(cirq.Gate):
-    
-    def __init__(self, d: int, g:int) -> None:
-        self._d = d
-        self._g = g
-    
-    """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-    
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_diagonal_matrix(self, d, g):
-        # Calculate the d'th root of unity
-        w = np.exp(2j * np.pi / d)
-    
-        # Create the diagonal matrix
-        diagonal_matrix = np.diag([w**(i**2 * g / 2) for i in range(d)])
-    
-        return diagonal_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.conjugate(self.create_diagonal_matrix(self._d, self._g)).T,dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return '[Pγ-]'
-    
\ No newline at end of file
+        """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+        
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, self._g % (2 * self._d)
+
+        def _value_equality_values_cls_(self):
+            return Pg
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            # The diagonal w^(i^2 g/2) has period 2d in g
+            return Pg(self._d, (self._g * exponent) % (2 * self._d))
+
+        def create_diagonal_matrix(self, d, g):
+            return GateCore.pg_matrix(d, g)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(self.create_diagonal_matrix(self._d, self._g),dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.diagonal_monomial(GateCore.pg_diagonal(self._d, self._g))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return '[Pγ]'
+
+    @cirq.value_equality(manual_cls=True)
+    class Pgdag(cirq.Gate):
+        
+        def __init__(self, d: int, g:int) -> None:
+            self._d = d
+            self._g = g
+        
+        """A gate that enacts the transformation U|x〉 = w^d|x〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+        
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, -self._g % (2 * self._d)
+
+        def _value_equality_values_cls_(self):
+            return Pg
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return Pg(self._d, (-self._g * exponent) % (2 * self._d))
+
+        def create_diagonal_matrix(self, d, g):
+            return GateCore.pg_matrix(d, g)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.conjugate(self.create_diagonal_matrix(self._d, self._g)).T,dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.diagonal_monomial(np.conjugate(GateCore.pg_diagonal(self._d, self._g)))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return '[Pγ-]'
+
+    return Phase, Phasedag, Pg, Pgdag
+
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:44:12 2026
+
+Overlapped simulate/decode pipeline
+
+In Simulate_Flag every shot goes through simulation, syndrome extraction,
+decoding, hook-map lookup and correction one after another in one thread, so
+each stage waits for all the others. Pipeline runs the stages side by side:
+the batches from a source go through a bounded queue into every stage, each
+stage has its own worker threads, and the main thread tallies the results of
+the last stage. The bounded queues keep at most queue_size batches waiting per
+stage, so a fast producer cannot fill the memory with state vectors.
+
+Stages whose work releases the GIL (pymatching, BeliefMatching's BP in C++,
+NumPy on large states) run in parallel with the others, and the throughput
+approaches that of the slowest stage instead of the sum of the stages. A stage
+that needs exclusive state (e.g. one Executor.CompiledCircuit) gets one thread.
+Batches reach the tally in the order they finish, so the tally has to be
+order-independent (counts). busy gives the time every stage spent working.
+
+@author: James Keppens
+"""
+#Imports
+import queue
+import threading
+import time
+
+_DONE = object()
+
+class Pipeline:
+
+    """Stages (name, function, threads) connected by bounded queues; function maps one batch to the next.
+    """
+
+    def __init__(self, stages, queue_size: int = 4) -> None:
+        if queue_size < 1:
+            raise ValueError("'queue_size' must be at least 1.")
+        for name, _, threads in stages:
+            if threads < 1:
+                raise ValueError(f"Stage '{name}' needs at least one thread.")
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.busy = {name: 0.0 for name, _, _ in self.stages}
+        self.wall = 0.0
+        self._lock = threading.Lock()
+        self._error = None
+
+    def _fail(self, error):
+        with self._lock:
+            if self._error is None:
+                self._error = error
+
+    def _worker(self, index, source, target, remaining):
+        name, function, _ = self.stages[index]
+        while True:
+            item = source.get()
+            if item is _DONE:
+                # Pass the end on to the other threads of this stage; the last one closes the next queue,
+                # so every thread takes one end and no end is left behind in the queue
+                with self._lock:
+                    remaining[index] -= 1
+                    last = remaining[index] == 0
+                if last:
+                    target.put(_DONE)
+                else:
+                    source.put(_DONE)
+                return
+            if self._error is not None:
+                continue
+            start = time.perf_counter()
+            try:
+                result = function(item)
+            except BaseException as error:
+                self._fail(error)
+                continue
+            with self._lock:
+                self.busy[name] += time.perf_counter() - start
+            target.put(result)
+
+    def _feed(self, items, first):
+        try:
+            for item in items:
+                if self._error is not None:
+                    break
+                first.put(item)
+        except BaseException as error:
+            self._fail(error)
+        first.put(_DONE)
+
+    def run(self, items, tally):
+        """Send every item of items through the stages and call tally on each result in the main thread."""
+        start = time.perf_counter()
+        self._error = None
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        remaining = [threads for _, _, threads in self.stages]
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0]), daemon=True)]
+        for index, (name, _, count) in enumerate(self.stages):
+            for i in range(count):
+                threads.append(threading.Thread(target=self._worker, args=(index, queues[index], queues[index + 1], remaining), name=f'{name}-{i}', daemon=True))
+        for thread in threads:
+            thread.start()
+        while True:
+            result = queues[-1].get()
+            if result is _DONE:
+                break
+            if self._error is None:
+                try:
+                    tally(result)
+                except BaseException as error:
+                    self._fail(error)
+        for thread in threads:
+            thread.join()
+        self.wall += time.perf_counter() - start
+        if self._error is not None:
+            raise self._error
+
+    def summary(self):
+        """Busy time per stage and the wall time; with perfect overlap the wall time is close to the largest busy time."""
+        return dict(self.busy, wall=self.wall)
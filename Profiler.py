@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:12:40 2026
+
+Stage profiler for the simulation loops
+
+@author: James Keppens
+"""
+#Imports
+import csv
+import json
+import time
+import tracemalloc
+
+class _NullStage:
+
+    """A context manager that does nothing, shared by every disabled stage.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class NullProfiler:
+
+    """Profiler used when profiling is switched off. Every call is a no-op.
+    """
+
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def end_shot(self):
+        pass
+
+    def close(self):
+        pass
+
+NULL = NullProfiler()
+
+class _Stage:
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler._add(self._name, time.perf_counter() - self._start)
+        return False
+
+class StageProfiler:
+
+    """Collects wall time, call counts and peak memory per stage for every batch of shots.
+    With memory=True the peak memory is tracked with tracemalloc. That slows down every allocation several times,
+    so take the timings and the memory peaks in separate runs. Tracing starts again when the profiler is reused after close().
+    """
+
+    enabled = True
+
+    def __init__(self, batch_size: int = 100, memory: bool = False) -> None:
+        if batch_size < 1:
+            raise ValueError("'batch_size' must be at least 1.")
+        self._batch_size = batch_size
+        self._memory = memory
+        self._own_tracing = False
+        self.records = []
+        self._batch = 0
+        self._shots = 0
+        self._times = {}
+        self._calls = {}
+        self._trace()
+
+    def _trace(self):
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracing = True
+            tracemalloc.reset_peak()
+
+    def stage(self, name):
+        # Use as 'with profiler.stage("decode"): ...'
+        if self._memory and not self._own_tracing:
+            self._trace()
+        return _Stage(self, name)
+
+    def _add(self, name, elapsed):
+        self._times[name] = self._times.get(name, 0.0) + elapsed
+        self._calls[name] = self._calls.get(name, 0) + 1
+
+    def end_shot(self):
+        self._shots += 1
+        if self._shots == self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._shots == 0:
+            return
+        peak = tracemalloc.get_traced_memory()[1] if self._memory else None
+        for name in self._times:
+            self.records.append({'batch': self._batch,
+                                 'shots': self._shots,
+                                 'stage': name,
+                                 'calls': self._calls[name],
+                                 'time_s': self._times[name],
+                                 'peak_mem_bytes': peak})
+        self._batch += 1
+        self._shots = 0
+        self._times = {}
+        self._calls = {}
+        if self._memory:
+            tracemalloc.reset_peak()
+
+    def close(self):
+        # Flush the last (possibly partial) batch and stop tracing if we started it.
+        self._flush()
+        if self._own_tracing:
+            tracemalloc.stop()
+            self._own_tracing = False
+
+    def summary(self):
+        """Total time and calls per stage over all batches."""
+        totals = {}
+        for rec in self.records:
+            entry = totals.setdefault(rec['stage'], {'calls': 0, 'time_s': 0.0, 'peak_mem_bytes': None})
+            entry['calls'] += rec['calls']
+            entry['time_s'] += rec['time_s']
+            if rec['peak_mem_bytes'] is not None:
+                entry['peak_mem_bytes'] = max(entry['peak_mem_bytes'] or 0, rec['peak_mem_bytes'])
+        return totals
+
+    def to_json(self, filepath):
+        """Save the per-batch records and the summary in a JSON file."""
+        self._flush()
+        with open(filepath, mode='w') as file:
+            json.dump({'records': self.records, 'summary': self.summary()}, file, indent=1)
+
+    def to_csv(self, filepath):
+        """Save the per-batch records in a CSV file."""
+        self._flush()
+        with open(filepath, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['batch', 'shots', 'stage', 'calls', 'time_s', 'peak_mem_bytes'])
+            for rec in self.records:
+                writer.writerow([rec['batch'], rec['shots'], rec['stage'], rec['calls'], rec['time_s'], rec['peak_mem_bytes']])
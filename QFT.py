@@ -8,115 +8,151 @@ Qudit QFT gate
 Based on https://quantumai.google/cirq/build/qudits
 """
 #Imports
-import cirq
 import numpy as np
-
-class H(cirq.Gate):
-    def __init__(self, d: int) -> None:
-        self._d = d
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-    
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_qft_matrix(self, d):
-        # Initialize the QFT matrix
-        qft_matrix = np.zeros((d, d), dtype=np.complex128)
-    
-        # Fill in the QFT matrix
-        for a in range(d):
-            for b in range(d):
-                qft_matrix[a, b] = np.exp(2j * np.pi * a * b / d)
-    
-        # Normalize the matrix
-        qft_matrix /= np.sqrt(d)
-    
-        return qft_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(self.create_qft_matrix(self._d),dtype=np.complex64)
-    def _circuit_diagram_info_(self, args):
-        return '[F]'
-    
-class Hinv(cirq.Gate):
-    def __init__(self, d: int) -> None:
-        self._d = d
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-    
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_qft_matrix(self, d):
-        # Initialize the QFT matrix
-        qft_matrix = np.zeros((d, d), dtype=np.complex128)
-    
-        # Fill in the QFT matrix
-        for a in range(d):
-            for b in range(d):
-                qft_matrix[a, b] = np.exp(2j * np.pi * a * b / d)
-
-        # Normalize the matrix
-        qft_matrix /= np.sqrt(d)
-    
-        return qft_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.linalg.inv(self.create_qft_matrix(self._d)),dtype=np.complex64)
-    def _circuit_diagram_info_(self, args):
-        return '[F-]'
-
-
-class Hdag(cirq.Gate):
-    def __init__(self, d: int) -> None:
-        self._d = d
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-    
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_qft_matrix(self, d):
-        # Initialize the QFT matrix
-        qft_matrix = np.zeros((d, d), dtype=np.complex128)
-    
-        # Fill in the QFT matrix
-        for a in range(d):
-            for b in range(d):
-                qft_matrix[a, b] = np.exp(2j * np.pi * a * b / d)
-    
-        # Normalize the matrix
-        qft_matrix /= np.sqrt(d)
-    
-        return qft_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.conjugate(self.create_qft_matrix(self._d)).T,dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return '[F*]'
\ No newline at end of file
+import GateCore
+import Id
+import Mul
+
+def _gates():
+    import cirq
+
+    @cirq.value_equality(manual_cls=True)
+    class H(cirq.Gate):
+        def __init__(self, d: int) -> None:
+            self._d = d
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+        
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d,
+
+        def _value_equality_values_cls_(self):
+            return H
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            # F^2|x〉 = |-x〉 and F^4 = I
+            return (Id.I(self._d), self, Mul.M(self._d, self._d - 1), Hdag(self._d))[exponent % 4]
+
+        def create_qft_matrix(self, d):
+            return GateCore.qft_matrix(d)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(self.create_qft_matrix(self._d),dtype=np.complex64)
+
+        def sparse_unitary(self):
+            from scipy import sparse
+            return sparse.csr_matrix(self._unitary_())
+
+        def _circuit_diagram_info_(self, args):
+            return '[F]'
+        
+    @cirq.value_equality(manual_cls=True)
+    class Hinv(cirq.Gate):
+        def __init__(self, d: int) -> None:
+            self._d = d
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+        
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d,
+
+        def _value_equality_values_cls_(self):
+            return Hdag
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return H(self._d) ** -exponent
+
+        def create_qft_matrix(self, d):
+            return GateCore.qft_matrix(d)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.linalg.inv(self.create_qft_matrix(self._d)),dtype=np.complex64)
+
+        def sparse_unitary(self):
+            from scipy import sparse
+            return sparse.csr_matrix(self._unitary_())
+
+        def _circuit_diagram_info_(self, args):
+            return '[F-]'
+
+
+    @cirq.value_equality(manual_cls=True)
+    class Hdag(cirq.Gate):
+        def __init__(self, d: int) -> None:
+            self._d = d
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+        
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d,
+
+        def _value_equality_values_cls_(self):
+            return Hdag
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return H(self._d) ** -exponent
+
+        def create_qft_matrix(self, d):
+            return GateCore.qft_matrix(d)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.conjugate(self.create_qft_matrix(self._d)).T,dtype=np.complex64)
+
+        def sparse_unitary(self):
+            from scipy import sparse
+            return sparse.csr_matrix(self._unitary_())
+
+        def _circuit_diagram_info_(self, args):
+            return '[F*]'
+
+    return H, Hinv, Hdag
+
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
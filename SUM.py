@@ -8,213 +8,285 @@ Qudit Sum gate
 Based on https://quantumai.google/cirq/build/qudits
 """
 #Imports
-import cirq
 import numpy as np
+import GateCore
+import Kernels
 
-class SUM(cirq.Gate):
-    
-    """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉.
-    """
-    
-    def __init__(self, m, n: int) -> None:
-        self._m = m
-        self._n = n
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (m,n)
-        # when cirq.qid_shape acts on an instance of this class.
-        # This indicates that the gate acts on a qubit and a ququart.
-        return (self._m,self._n)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_block_matrix(self, m, n):
-        if m < 1 or n < 1:
-            raise ValueError("Both 'm' and 'n' must be at least 1.")
-        
-        unitary_matrix = np.eye(n,dtype=np.complex128)
-        block_matrices = [np.roll(unitary_matrix.astype(np.complex128), i, axis=0) for i in range(m)]
-        
-        # Initialize the block matrix with zeros
-        block_matrix = np.zeros((m*n, m*n),dtype=np.complex128)
-        
-        # Fill the diagonal with block matrices
-        for i in range(m):
-            block_matrix[i*n:(i+1)*n, i*n:(i+1)*n] = block_matrices[i]
-        
-        return block_matrix
-
-    def _unitary_(self):
-        return np.array(self.create_block_matrix(self._m,self._n),dtype=np.complex128)
-    
-    def _circuit_diagram_info_(self, args):
-        return 'o','[+]'
-    
-class SUMinv(cirq.Gate):
-    
-    """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉.
-    """
-    
-    def __init__(self, m, n: int) -> None:
-        self._m = m
-        self._n = n
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (m,n)
-        # when cirq.qid_shape acts on an instance of this class.
-        # This indicates that the gate acts on a qubit and a ququart.
-        return (self._m,self._n)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_block_matrix(self, m, n):
-        if m < 1 or n < 1:
-            raise ValueError("Both 'm' and 'n' must be at least 1.")
-        
-        unitary_matrix = np.eye(n,dtype=np.complex128)
-        block_matrices = [np.roll(unitary_matrix.astype(np.complex128), i, axis=0) for i in range(m)]
-        
-        # Initialize the block matrix with zeros
-        block_matrix = np.zeros((m*n, m*n),dtype=np.complex128)
-        
-        # Fill the diagonal with block matrices
-        for i in range(m):
-            block_matrix[i*n:(i+1)*n, i*n:(i+1)*n] = block_matrices[i]
-        
-        return block_matrix
-
-    def _unitary_(self):
-        return np.array(np.linalg.inv(self.create_block_matrix(self._m,self._n)),dtype=np.complex128)
-    
-    def _circuit_diagram_info_(self, args):
-        return 'o','[-]'
-    
-class SUMdag(cirq.Gate):
-    
-    """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉.
-    """
-    
-    def __init__(self, m, n: int) -> None:
-        self._m = m
-        self._n = n
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (m,n)
-        # when cirq.qid_shape acts on an instance of this class.
-        # This indicates that the gate acts on a qubit and a ququart.
-        return (self._m,self._n)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_block_matrix(self, m, n):
-        if m < 1 or n < 1:
-            raise ValueError("Both 'm' and 'n' must be at least 1.")
-        
-        unitary_matrix = np.eye(n,dtype=np.complex128)
-        block_matrices = [np.roll(unitary_matrix.astype(np.complex128), i, axis=0) for i in range(m)]
-        
-        # Initialize the block matrix with zeros
-        block_matrix = np.zeros((m*n, m*n),dtype=np.complex128)
-        
-        # Fill the diagonal with block matrices
-        for i in range(m):
-            block_matrix[i*n:(i+1)*n, i*n:(i+1)*n] = block_matrices[i]
-        
-        return block_matrix
-
-    def _unitary_(self):
-        return np.array(np.conjugate(self.create_block_matrix(self._m,self._n)).T,dtype=np.complex128)
-    
-    def _circuit_diagram_info_(self, args):
-        return 'o','[+*]'
-    
-class MIN(cirq.Gate):
-    
-    """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉.
-    """
-    
-    def __init__(self, m, n: int) -> None:
-        self._m = m
-        self._n = n
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (m,n)
-        # when cirq.qid_shape acts on an instance of this class.
-        # This indicates that the gate acts on a qubit and a ququart.
-        return (self._m,self._n)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_block_matrix(self, m, n):
-        if m < 1 or n < 1:
-            raise ValueError("Both 'm' and 'n' must be at least 1.")
-        
-        unitary_matrix = np.eye(n,dtype=np.complex128)
-        block_matrices = [np.roll(unitary_matrix.astype(np.complex128), -i, axis=0) for i in range(m)]
-        
-        # Initialize the block matrix with zeros
-        block_matrix = np.zeros((m*n, m*n),dtype=np.complex128)
-        
-        # Fill the diagonal with block matrices
-        for i in range(m):
-            block_matrix[i*n:(i+1)*n, i*n:(i+1)*n] = block_matrices[i]
-        
-        return block_matrix
-
-    def _unitary_(self):
-        return np.array(self.create_block_matrix(self._m,self._n),dtype=np.complex128)
-    
-    def _circuit_diagram_info_(self, args):
-        return 'o','[-]'
-
-class CShift(cirq.Gate):
-    
-    """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + 1 mod d〉 if m is not 0.
-    """
-    
-    def __init__(self, m, n: int) -> None:
-        self._m = m
-        self._n = n
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (m,n)
-        # when cirq.qid_shape acts on an instance of this class.
-        # This indicates that the gate acts on a qubit and a ququart.
-        return (self._m,self._n)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_block_matrix_adapted(self, m, n):
-        if m < 1 or n < 1:
-            raise ValueError("Both 'm' and 'n' must be at least 1.")
-        
-        unitary_matrix = np.eye(n, dtype=np.complex128)
-        first_block_matrix = np.roll(unitary_matrix.astype(np.complex128), 0, axis=0)  # No row roll for the first block
-        rest_block_matrices = [np.roll(unitary_matrix.astype(np.complex128), 1, axis=0) for _ in range(m - 1)]
-    
-        # Initialize the block matrix with zeros
-        block_matrix = np.zeros((m * n, m * n), dtype=np.complex128)
-    
-        # Fill the diagonal with block matrices
-        block_matrix[:n, :n] = first_block_matrix
-        for i in range(1, m):
-            block_matrix[i * n:(i + 1) * n, i * n:(i + 1) * n] = rest_block_matrices[i - 1]
-    
-        return block_matrix
-
-
-    def _unitary_(self):
-        return np.array(self.create_block_matrix_adapted(self._m,self._n),dtype=np.complex128)
-    
-    def _circuit_diagram_info_(self, args):
-        return 'o','[+]'
+def _gates():
+    import cirq
+
+    @cirq.value_equality(manual_cls=True)
+    class SUM(cirq.Gate):
+        
+        """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉, or |m〉|n + k*m mod d〉 for SUM**k.
+        """
+        
+        def __init__(self, m, n: int, k: int = 1) -> None:
+            self._m = m
+            self._n = n
+            self._k = k
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (m,n)
+            # when cirq.qid_shape acts on an instance of this class.
+            # This indicates that the gate acts on a qubit and a ququart.
+            return (self._m,self._n)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._m, self._n, self._k % self._n
+
+        def _value_equality_values_cls_(self):
+            return SUM
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return SUM(self._m, self._n, self._k * exponent)
+
+        def create_block_matrix(self, m, n):
+            return GateCore.sum_matrix(m, n, self._k)
+
+        def _unitary_(self):
+            return np.array(self.create_block_matrix(self._m,self._n),dtype=np.complex128)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.permutation_monomial(GateCore.sum_permutation(self._m, self._n, sign=self._k))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+        
+        def _circuit_diagram_info_(self, args):
+            if self._k % self._n == 1:
+                return 'o','[+]'
+            return 'o',f'[+{self._k % self._n}]'
+        
+    @cirq.value_equality(manual_cls=True)
+    class SUMinv(cirq.Gate):
+        
+        """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉.
+        """
+        
+        def __init__(self, m, n: int) -> None:
+            self._m = m
+            self._n = n
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (m,n)
+            # when cirq.qid_shape acts on an instance of this class.
+            # This indicates that the gate acts on a qubit and a ququart.
+            return (self._m,self._n)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._m, self._n, -1 % self._n
+
+        def _value_equality_values_cls_(self):
+            return SUM
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return SUM(self._m, self._n, -exponent)
+
+        def create_block_matrix(self, m, n):
+            return GateCore.sum_matrix(m, n)
+
+        def _unitary_(self):
+            return np.array(np.linalg.inv(self.create_block_matrix(self._m,self._n)),dtype=np.complex128)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.permutation_monomial(GateCore.sum_permutation(self._m, self._n, sign=-1))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+        
+        def _circuit_diagram_info_(self, args):
+            return 'o','[-]'
+        
+    @cirq.value_equality(manual_cls=True)
+    class SUMdag(cirq.Gate):
+        
+        """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉.
+        """
+        
+        def __init__(self, m, n: int) -> None:
+            self._m = m
+            self._n = n
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (m,n)
+            # when cirq.qid_shape acts on an instance of this class.
+            # This indicates that the gate acts on a qubit and a ququart.
+            return (self._m,self._n)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._m, self._n, -1 % self._n
+
+        def _value_equality_values_cls_(self):
+            return SUM
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return SUM(self._m, self._n, -exponent)
+
+        def create_block_matrix(self, m, n):
+            return GateCore.sum_matrix(m, n)
+
+        def _unitary_(self):
+            return np.array(np.conjugate(self.create_block_matrix(self._m,self._n)).T,dtype=np.complex128)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.permutation_monomial(GateCore.sum_permutation(self._m, self._n, sign=-1))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+        
+        def _circuit_diagram_info_(self, args):
+            return 'o','[+*]'
+        
+    @cirq.value_equality(manual_cls=True)
+    class MIN(cirq.Gate):
+        
+        """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + m mod d〉.
+        """
+        
+        def __init__(self, m, n: int) -> None:
+            self._m = m
+            self._n = n
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (m,n)
+            # when cirq.qid_shape acts on an instance of this class.
+            # This indicates that the gate acts on a qubit and a ququart.
+            return (self._m,self._n)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._m, self._n, -1 % self._n
+
+        def _value_equality_values_cls_(self):
+            return SUM
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return SUM(self._m, self._n, -exponent)
+
+        def create_block_matrix(self, m, n):
+            return GateCore.sum_matrix(m, n, sign=-1)
+
+        def _unitary_(self):
+            return np.array(self.create_block_matrix(self._m,self._n),dtype=np.complex128)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.permutation_monomial(GateCore.sum_permutation(self._m, self._n, sign=-1))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+        
+        def _circuit_diagram_info_(self, args):
+            return 'o','[-]'
+
+    @cirq.value_equality(manual_cls=True)
+    class CShift(cirq.Gate):
+        
+        """A conditional gate that enacts the transformation SUM|m〉|n〉 = |m〉|n + 1 mod d〉 if m is not 0.
+        """
+        
+        def __init__(self, m, n: int, k: int = 1) -> None:
+            self._m = m
+            self._n = n
+            self._k = k
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (m,n)
+            # when cirq.qid_shape acts on an instance of this class.
+            # This indicates that the gate acts on a qubit and a ququart.
+            return (self._m,self._n)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._m, self._n, self._k % self._n
+
+        def _value_equality_values_cls_(self):
+            return CShift
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return CShift(self._m, self._n, self._k * exponent)
+
+        def create_block_matrix_adapted(self, m, n):
+            return GateCore.cshift_matrix(m, n, self._k)
+
+
+        def _unitary_(self):
+            return np.array(self.create_block_matrix_adapted(self._m,self._n),dtype=np.complex128)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.permutation_monomial(GateCore.cshift_permutation(self._m, self._n, self._k))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+        
+        def _circuit_diagram_info_(self, args):
+            if self._k % self._n == 1:
+                return 'o','[+]'
+            return 'o',f'[+{self._k % self._n}]'
+
+    return SUM, SUMinv, SUMdag, MIN, CShift
+
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
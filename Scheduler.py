@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:42:51 2026
+
+Moment-packing scheduler
+
+dep_circ and Real_circ put nearly every operation in a moment of its own, also
+when neighbouring operations act on different qudits. This makes the circuits
+deeper than the hardware would run them, every moment is a simulator step, and
+the idle noise sits where the builder put it rather than where qudits wait.
+
+schedule packs the operations as soon as possible under a gate-duration model:
+an operation starts when all its qudits are free, and keeps them busy for its
+duration. The order of the operations on every qudit is kept, so the circuit
+does the same thing. A noise channel directly followed by an operation on the
+same qudits (the gate error before a gate, the measurement error before a
+measurement) moves with that operation. Other noise channels are idle noise.
+With idle=None they are kept. Given an idle channel, they are dropped and idle
+is put on every qudit that waits during a time step, between its first and
+last operation (only on the given qudits, e.g. the data qudits, if any). The
+noiseless encoder (see Checkpoint.split_at_noise) is packed without idle noise.
+
+The schedule changes the noise locations, so hook maps and fault lists made for
+the original circuit do not apply to it (HookMap.cached makes new ones).
+
+@author: James Keppens
+"""
+
+def _is_noise(op):
+    import cirq
+    return not cirq.is_measurement(op) and not isinstance(op.gate, cirq.ResetChannel) and not cirq.has_unitary(op)
+
+def _kind(op):
+    import cirq
+    if cirq.is_measurement(op):
+        return 'measure'
+    if isinstance(op.gate, cirq.ResetChannel):
+        return 'reset'
+    return 'one' if len(op.qubits) == 1 else 'two'
+
+def duration(op, durations=None):
+    """Time steps of an operation; durations maps 'one', 'two', 'measure' and 'reset' to steps (1 if missing) or is a function of op."""
+    if durations is None:
+        return 1
+    if callable(durations):
+        return int(durations(op))
+    return int(durations.get(_kind(op), 1))
+
+def _units(ops, keep_idle):
+    # Group every operation with the noise channels attached to it, in circuit order
+    following = [None] * len(ops)
+    last = {}
+    for i in range(len(ops) - 1, -1, -1):
+        following[i] = {q: last.get(q) for q in ops[i].qubits}
+        for q in ops[i].qubits:
+            last[q] = i
+    attached = {}
+    units = []
+    for i, op in enumerate(ops):
+        if _is_noise(op):
+            targets = set(following[i].values())
+            if len(targets) == 1 and None not in targets:
+                j = targets.pop()
+                if not _is_noise(ops[j]):
+                    attached.setdefault(j, []).append(op)
+                    continue
+            if keep_idle:
+                units.append((list(op.qubits), [op], None))
+        else:
+            units.append((list(op.qubits), attached.pop(i, []), op))
+    return units
+
+def _pack(ops, durations, idle, qudits):
+    units = _units(ops, keep_idle=idle is None)
+    free = {}
+    # Per time step: the noise channels (in order) and the operations starting then
+    noise = {}
+    starts = {}
+    busy = {}
+    for targets, channels, op in units:
+        t = max((free.get(q, 0) for q in targets), default=0)
+        noise.setdefault(t, []).extend(channels)
+        if op is None:
+            for q in targets:
+                free[q] = t
+            continue
+        steps = duration(op, durations)
+        starts.setdefault(t, []).append(op)
+        for q in targets:
+            free[q] = t + steps
+            busy.setdefault(q, set()).update(range(t, t + steps))
+    end = max(free.values(), default=0)
+    idle_sites = 0
+    if idle is not None:
+        for q in qudits:
+            if q not in busy:
+                continue
+            for t in range(min(busy[q]), max(busy[q]) + 1):
+                if t not in busy[q]:
+                    noise.setdefault(t, []).append(idle.on(q))
+                    idle_sites += 1
+    ops = []
+    for t in range(end):
+        ops.extend(noise.get(t, []))
+        ops.extend(starts.get(t, []))
+    return ops, end, idle_sites
+
+def schedule(circuit, qudits=None, durations=None, idle=None):
+    """Pack a circuit into as few moments as the durations allow, optionally with idle noise on waiting qudits.
+
+    qudits are the qudits that get idle noise, all qudits of the circuit by default.
+    Returns the scheduled circuit and a report with the depth, duration and number of noise sites before and after.
+    """
+    import cirq
+    import Checkpoint
+    if qudits is None:
+        qudits = sorted(circuit.all_qubits())
+    prefix, rest = Checkpoint.split_at_noise(circuit)
+    encoder, encoder_time, _ = _pack(list(prefix.all_operations()), durations, None, qudits)
+    ops, rest_time, idle_sites = _pack(list(rest.all_operations()), durations, idle, qudits)
+    # In time order, every operation goes in the earliest moment after the last one on its qudits, so noise
+    # channels share moments with gates on other qudits. The encoder stays apart as the noiseless prefix.
+    scheduled = cirq.Circuit(encoder) + cirq.Circuit(ops)
+    report = {'depth_before': len(circuit),
+              'depth_after': len(scheduled),
+              'duration': encoder_time + rest_time,
+              'noise_before': sum(1 for op in circuit.all_operations() if _is_noise(op)),
+              'noise_after': sum(1 for op in scheduled.all_operations() if _is_noise(op)),
+              'idle_sites': idle_sites}
+    return scheduled, report
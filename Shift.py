@@ -8,75 +8,119 @@ Qudit Shift gate
 Based on https://quantumai.google/cirq/build/qudits
 """
 #Imports
-import cirq
 import numpy as np
+import GateCore
+import Kernels
 
-class Shift(cirq.Gate):
-    
-    def __init__(self, d: int, a: int) -> None:
-        self._d = d
-        self._a = a
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_shift_matrix(self, d, a):
-        if d < 2:
-            raise ValueError("Dimension 'd' must be at least 2.")
-        if a > d:
-            raise ValueError("Shift cannot be larger than the Dimension 'd'")
-        # Perform the shift operation (x -> x+1 mod d) on the matrix
-        shift_matrix = np.roll(np.eye(d), -1*a, axis=0)
+def _gates():
+    import cirq
+
+    @cirq.value_equality(manual_cls=True)
+    class Shift(cirq.Gate):
+        
+        def __init__(self, d: int, a: int) -> None:
+            self._d = d
+            self._a = a
+        
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, self._a % self._d
+
+        def _value_equality_values_cls_(self):
+            return Shift
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return Shift(self._d, (self._a * exponent) % self._d)
+
+        def create_shift_matrix(self, d, a):
+            return GateCore.shift_matrix(d, a)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(self.create_shift_matrix(self._d,self._a),dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.shift_monomial(self._d, self._a)
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return f'[X({self._a})]'
+        
+    @cirq.value_equality(manual_cls=True)
+    class Shiftdag(cirq.Gate):
         
-        return shift_matrix
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(self.create_shift_matrix(self._d,self._a),dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return f'[X({self._a})]'
-    
-class Shiftdag(cirq.Gate):
-    
-    def __init__(self, d: int, a: int) -> None:
-        self._d = d
-        self._a = a
-    
-    """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_shift_matrix(self, d, a):
-        if d < 2:
-            raise ValueError("Dimension 'd' must be at least 2.")
-        if a > d:
-            raise ValueError("Shift cannot be larger than the Dimension 'd'")
-        # Perform the shift operation (x -> x+1 mod d) on the matrix
-        shift_matrix = np.roll(np.eye(d), -1*a, axis=0)
+        def __init__(self, d: int, a: int) -> None:
+            self._d = d
+            self._a = a
         
-        return shift_matrix
+        """A gate that enacts the transformation U|x〉 = |x + 1 mod d〉 on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, -self._a % self._d
+
+        def _value_equality_values_cls_(self):
+            return Shift
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            return Shift(self._d, (-self._a * exponent) % self._d)
+
+        def create_shift_matrix(self, d, a):
+            return GateCore.shift_matrix(d, a)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.conjugate(self.create_shift_matrix(self._d,self._a)).T,dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.monomial_inverse(*GateCore.shift_monomial(self._d, self._a))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            return f'[X*({self._a})]'
 
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.conjugate(self.create_shift_matrix(self._d,self._a)).T,dtype=np.complex64)
+    return Shift, Shiftdag
 
-    def _circuit_diagram_info_(self, args):
-        return f'[X*({self._a})]'
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
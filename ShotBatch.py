@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:52:06 2026
+
+Shot-batched state-vector engine
+
+At d = 2 the 10-qudit state has 1024 amplitudes, so a shot is almost all Python
+overhead, also in the compiled executor. BatchedCircuit keeps the states of
+many shots in one array of shape (shots, d, ..., d) and runs the op list of
+Executor.CompiledCircuit on all of them at once: every gate is one vectorized
+operation over the shots axis.
+
+The noise of every site and every shot is drawn in one call. For each site the
+shots where it fires are grouped by the Pauli drawn, and the Pauli is applied to
+that group with an index array over the shots axis. A measurement samples all
+shots at once from their own probabilities and collapses them with one
+broadcast multiplication; a reset then moves every shot's outcome back to |0〉
+with one np.take_along_axis.
+
+corrects checks many corrections against the reference state: the overlap of a
+state with the reference is compared after moving the correction onto the
+reference, which is done once per distinct correction.
+
+@author: James Keppens
+"""
+#Imports
+from collections import namedtuple
+import numpy as np
+import Executor
+import Pauli
+
+# measurements: {key: array of shape (shots, qudits)} like cirq's run; states: (shots, d^n)
+BatchResult = namedtuple('BatchResult', ['measurements', 'states'])
+
+class BatchedCircuit(Executor.CompiledCircuit):
+
+    """A compiled circuit that simulates a batch of shots per call, with the shots as the leading array axis.
+    """
+
+    def __init__(self, circuit, qudits, dtype=np.complex64, max_index: int = 1 << 20) -> None:
+        super().__init__(circuit, qudits, dtype, max_index)
+        self._batch = {}
+        self._reference_state = None
+        self._references = {}
+
+    def _batch_buffers(self, shots):
+        if shots not in self._batch:
+            # Keep the buffers of the last batch size only
+            self._batch = {shots: (np.empty((shots,) + self.shape, dtype=self.dtype), np.empty((shots,) + self.shape, dtype=self.dtype))}
+        return self._batch[shots]
+
+    def _noise(self, a, b, op, shots, choices):
+        for choice in np.unique(choices):
+            group = shots[choices == choice]
+            part = a[group]
+            spare = np.empty_like(part)
+            for axis, code in zip(op[1], self._paulis[op[2]][choice]):
+                if code:
+                    for pauli in self._pauli_op(axis, int(code)):
+                        part, spare = self._apply(pauli, part, spare)
+            a[group] = part
+        return a, b
+
+    def _measure_batch(self, a, b, axis, prng, reset=False):
+        shots = len(a)
+        left = self.d**axis
+        a4 = a.reshape(shots, left, self.d, -1)
+        parts = a.view(a.real.dtype).reshape(shots, left, -1)
+        p = np.einsum('slc,slc->sc', parts, parts).reshape(shots, self.d, -1).sum(axis=2)
+        cdf = np.cumsum(p, axis=1)
+        draws = prng.random(shots) * cdf[:, -1]
+        outcomes = np.minimum(np.sum(cdf <= draws[:, None], axis=1), self.d - 1)
+        scale = 1 / np.sqrt(p[np.arange(shots), outcomes])
+        mask = (np.arange(self.d)[None, :] == outcomes[:, None]) * scale[:, None]
+        a4 *= mask.astype(a.dtype).reshape(shots, 1, self.d, 1)
+        if reset and np.any(outcomes):
+            # Slot k of every shot takes slot k + outcome, so the outcome lands on |0〉
+            index = (np.arange(self.d)[None, :] + outcomes[:, None]) % self.d
+            b.reshape(shots, left, self.d, -1)[...] = np.take_along_axis(a4, index.reshape(shots, 1, self.d, 1), axis=2)
+            return outcomes, b, a
+        return outcomes, a, b
+
+    def run(self, shots, prng=None):
+        """Simulate a batch of shots from the encoded state. The states are a view of an internal buffer, valid until the next run."""
+        if prng is None:
+            prng = np.random.default_rng()
+        a, b = self._batch_buffers(shots)
+        a[...] = self._start
+        # Every site of every shot in one draw; (shot, site) pairs that fire, grouped per site
+        draws = prng.random((shots, self.sites))
+        fired_sites, fired_shots = np.nonzero((draws >= self._identity).T)
+        bounds = np.searchsorted(fired_sites, np.arange(self.sites + 1))
+        measurements = {}
+        for op in self.ops:
+            kind = op[0]
+            if kind == 'noise':
+                site = op[2]
+                hit = fired_shots[bounds[site]:bounds[site + 1]]
+                if len(hit):
+                    cdf = self._cdfs[site]
+                    choices = np.minimum(np.searchsorted(cdf, draws[hit, site], side='right'), len(cdf) - 1)
+                    a, b = self._noise(a, b, op, hit, choices)
+            elif kind == 'measure':
+                outcomes = []
+                for axis in op[1]:
+                    outcome, a, b = self._measure_batch(a, b, axis, prng)
+                    outcomes.append(outcome)
+                measurements[op[2]] = np.stack(outcomes, axis=1)
+            elif kind == 'reset':
+                _, a, b = self._measure_batch(a, b, op[1], prng, reset=True)
+            else:
+                a, b = self._apply(op, a, b)
+        return BatchResult(measurements, a.reshape(shots, -1))
+
+    def _reference(self, reference, key):
+        if reference is not self._reference_state:
+            self._reference_state = reference
+            self._references = {}
+        if key not in self._references:
+            # The error moved onto the reference: |〈P ref|psi〉| = |〈ref|P^-1 psi〉|, the overlap after the correction
+            state = np.asarray(reference, dtype=self.dtype).reshape(self.shape).copy()
+            spare = np.empty_like(state)
+            for error in key:
+                qudit, x, z = Pauli.decode(error, self.d)
+                for pauli in self._pauli_op(qudit, int(x * self.d + z)):
+                    state, spare = self._apply(pauli, state, spare)
+            self._references[key] = np.conjugate(state.reshape(-1))
+        return self._references[key]
+
+    def corrects(self, states, corrections, reference, atol: float = 1e-4):
+        """For every shot, whether undoing its error codes (like C_circ) gives the reference state up to a global phase."""
+        keys = [tuple(sorted(int(e) for e in errors)) for errors in corrections]
+        result = np.zeros(len(keys), dtype=bool)
+        groups = {}
+        for shot, key in enumerate(keys):
+            groups.setdefault(key, []).append(shot)
+        for key, group in groups.items():
+            overlaps = states[group] @ self._reference(reference, key)
+            result[group] = np.abs(np.abs(overlaps) - 1) < atol
+        return result
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:25:52 2026
+
+Sliding-window decoding
+
+Decoding the detector vector of all cycles at once needs the whole history in
+memory and a matching graph that grows with the number of cycles. The
+SlidingWindowDecoder takes the detectors one round at a time and decodes a
+window of `window` rounds as soon as it is full. The matched edges that touch
+the oldest `commit` rounds are committed: their fault ids are added to the
+correction and their syndrome data is dropped. A committed edge that reaches
+into the next round (a time edge) flips that detector, so the rest of its
+chain is matched in the next window. At the end, flush decodes the remaining
+rounds and commits everything.
+
+Memory and decoding time per round do not depend on the number of cycles, only
+on the window. The matching graphs come from build(rounds), e.g.
+create_matching_graph(d, rounds, id_list, weights), and are made once per size.
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+
+class SlidingWindowDecoder:
+
+    """Streaming matching decoder for detectors that arrive in rounds of nodes_per_round bits.
+    """
+
+    def __init__(self, build, nodes_per_round: int, window: int = 4, commit: int = 2) -> None:
+        if not 1 <= commit <= window:
+            raise ValueError("'commit' must be between 1 and 'window'.")
+        self._build = build
+        self._graphs = {}
+        self._faults = {}
+        self.nodes_per_round = nodes_per_round
+        self.window = window
+        self.commit = commit
+        self.reset()
+
+    def reset(self):
+        self._rounds = np.zeros((self.window, self.nodes_per_round), dtype=np.uint8)
+        self._filled = 0
+        self._correction = None
+
+    def graph(self, rounds):
+        if rounds not in self._graphs:
+            self._graphs[rounds] = self._build(rounds)
+            self._faults[rounds] = {}
+        return self._graphs[rounds]
+
+    def _fault_ids(self, rounds, u, v):
+        # Fault ids of a matched edge, v = -1 for the boundary
+        faults = self._faults[rounds]
+        if (u, v) not in faults:
+            graph = self._graphs[rounds]
+            data = graph.get_boundary_edge_data(u) if v < 0 else graph.get_edge_data(u, v)
+            faults[(u, v)] = tuple(data['fault_ids'])
+        return faults[(u, v)]
+
+    def _decode(self, rounds, commit):
+        # Match the first `rounds` buffered rounds and commit the edges that touch the first `commit` of them
+        graph = self.graph(rounds)
+        if self._correction is None:
+            self._correction = np.zeros(self.graph(self.window).num_fault_ids, dtype=np.uint8)
+        limit = commit * self.nodes_per_round
+        syndrome = self._rounds[:rounds].reshape(-1)
+        flips = []
+        for u, v in graph.decode_to_edges_array(syndrome):
+            if v >= 0 and u > v:
+                u, v = v, u
+            if u < 0:
+                u, v = v, u
+            if u >= limit:
+                continue
+            for fault in self._fault_ids(rounds, u, v):
+                self._correction[fault] ^= 1
+            if v >= limit:
+                flips.append(v - limit)
+        kept = self._rounds[commit:rounds].copy()
+        self._rounds[:] = 0
+        self._rounds[:len(kept)] = kept
+        if flips:
+            np.bitwise_xor.at(self._rounds.reshape(-1), flips, 1)
+        self._filled = rounds - commit
+
+    def push(self, detectors):
+        """Add the detectors of the next round, decoding a window when it is full."""
+        self._rounds[self._filled] = np.asarray(detectors, dtype=np.uint8)
+        self._filled += 1
+        if self._filled == self.window:
+            self._decode(self.window, self.commit)
+
+    def flush(self):
+        """Decode the remaining rounds and return the committed correction as a 0/1 vector over the fault ids (like graph.decode)."""
+        if self._filled > 0:
+            self._decode(self._filled, self._filled)
+        if self._correction is None:
+            self._correction = np.zeros(self.graph(self.window).num_fault_ids, dtype=np.uint8)
+        correction = self._correction
+        self.reset()
+        return correction
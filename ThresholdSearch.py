@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:32:30 2026
+
+Adaptive threshold search
+
+A fixed grid of p values spends most of its shots far from where the logical
+error rate curves of two dimensions cross, or where the logical error rate of
+one dimension crosses p (the pseudo-threshold; in Data_paper the curves of the
+dimensions do not cross, but FlagCorr crosses p). ThresholdSearch bisects the
+bracket [low, high] in log p instead. At every midpoint the dimensions are run
+in batches until the sign of the difference is significant or max_shots is
+reached. The bracket then moves to the half with the sign
+change. A midpoint that stays undecided at max_shots is close to the crossing,
+so the quarter points on both sides are tried next; when those are undecided
+too, the bracket is at the statistical resolution and the search ends.
+
+The sign is tested again after every batch, so a point gets up to
+looks = ceil(max_shots/batch) tests. Each of them is made at level
+alpha/looks, with alpha = P(|N(0,1)| > z), which keeps the error of a point at
+most alpha however many looks it takes. Every look is counted, and the final
+bracket holds the crossing with probability at least 1 - (number of looks) *
+alpha/looks. With batch = max_shots there is one test per point at level alpha.
+The estimate is the zero of a weighted straight line through the differences
+measured in the bracket, against log p.
+
+load_grid reads a fixed sweep like Data_paper, e.g. to choose the starting
+bracket or to compare with.
+
+@author: James Keppens
+"""
+#Imports
+import glob
+import math
+import os
+import re
+from statistics import NormalDist
+import numpy as np
+
+class ThresholdSearch:
+
+    """Bisection on the sign of rate(dims[1]) - rate(dims[0]), or of rate(dims[0]) - p for one dimension.
+    run(d, p, shots) returns the number of logical failures in that many shots.
+    """
+
+    def __init__(self, run, dims=(2, 3), batch: int = 100, max_shots: int = 10000, z: float = 2.576) -> None:
+        if len(dims) not in (1, 2):
+            raise ValueError("'dims' must hold one or two dimensions.")
+        self._run = run
+        self.dims = tuple(dims)
+        self.batch = batch
+        self.max_shots = max_shots
+        self.z = z
+        # Bonferroni over the looks at one point
+        self.looks = math.ceil(max_shots / batch)
+        self.alpha = math.erfc(z / math.sqrt(2)) / self.looks
+        self.z_look = NormalDist().inv_cdf(1 - self.alpha / 2)
+        self.tests = 0
+        # p -> {d: [failures, shots]}
+        self.points = {}
+
+    def _add(self, p, shots):
+        counts = self.points.setdefault(p, {d: [0, 0] for d in self.dims})
+        for d in self.dims:
+            counts[d][0] += int(self._run(d, p, shots))
+            counts[d][1] += shots
+
+    def difference(self, p):
+        """rate(dims[1]) - rate(dims[0]) (or rate(dims[0]) - p) at p and its standard error."""
+        rates = []
+        variance = 0.0
+        for d in self.dims:
+            failures, shots = self.points[p][d]
+            rate = failures / shots
+            # Keep the variance away from 0 for few or no failures
+            smoothed = (failures + 0.5) / (shots + 1)
+            rates.append(rate)
+            variance += smoothed * (1 - smoothed) / shots
+        if len(rates) == 1:
+            return rates[0] - p, math.sqrt(variance)
+        return rates[1] - rates[0], math.sqrt(variance)
+
+    def evaluate(self, p):
+        """Run batches at p until the sign of the difference is significant; returns -1, 1 or 0 (undecided)."""
+        while True:
+            shots = self.points.get(p, {self.dims[0]: [0, 0]})[self.dims[0]][1]
+            if shots >= self.max_shots:
+                return 0
+            self._add(p, min(self.batch, self.max_shots - shots))
+            self.tests += 1
+            diff, se = self.difference(p)
+            if abs(diff) > self.z_look * se:
+                return int(np.sign(diff))
+
+    @property
+    def shots(self):
+        return sum(counts[d][1] for counts in self.points.values() for d in self.dims)
+
+    def search(self, low, high, steps: int = 8, rtol: float = 0.05):
+        """Bisect [low, high] in log p; returns the estimate, the bracket as interval, its confidence level and the shots used."""
+        tests_before = self.tests
+        if self.evaluate(low) != -1 or self.evaluate(high) != 1:
+            raise ValueError("The rates do not cross significantly between 'low' and 'high'.")
+        undecided = []
+        for _ in range(steps):
+            if high / low < 1 + rtol:
+                break
+            middle = math.sqrt(low * high)
+            sign = self.evaluate(middle)
+            if sign < 0:
+                low = middle
+            elif sign > 0:
+                high = middle
+            else:
+                # The crossing is near the middle: close in from both sides with the quarter points
+                undecided.append(middle)
+                left, right = math.sqrt(low * middle), math.sqrt(middle * high)
+                left_sign, right_sign = self.evaluate(left), self.evaluate(right)
+                if left_sign < 0:
+                    low = left
+                elif left_sign > 0:
+                    high = left
+                if right_sign > 0:
+                    high = min(high, right)
+                elif right_sign < 0:
+                    low = max(low, right)
+                if left_sign == 0 and right_sign == 0:
+                    undecided.extend([left, right])
+                    break
+        # Weighted line through the differences in the bracket, zero in log p
+        ps = [p for p in self.points if low <= p <= high]
+        x = np.log(ps)
+        y, se = np.array([self.difference(p) for p in ps]).T
+        slope, intercept = np.polyfit(x, y, 1, w=1 / se)
+        estimate = math.exp(-intercept / slope) if slope > 0 else math.sqrt(low * high)
+        return {'threshold': min(max(estimate, low), high),
+                'interval': (low, high),
+                'confidence': max(0.0, 1 - (self.tests - tests_before) * self.alpha),
+                'shots': self.shots,
+                'undecided': undecided}
+
+def load_grid(folder, dims=(2, 3, 5), prefix='Final2', cycles=3):
+    """Mean logical error rate per p of a fixed sweep stored as {prefix}_perstep{p}_cycles{cycles}_dimension{d}.csv files."""
+    grid = {}
+    for d in dims:
+        for path in glob.glob(os.path.join(folder, f'{prefix}_perstep*_cycles{cycles}_dimension{d}.csv')):
+            p = float(re.search(r'perstep([0-9.]+)_', os.path.basename(path)).group(1))
+            grid.setdefault(p, {})[d] = float(np.mean(np.loadtxt(path, ndmin=1)))
+    return dict(sorted(grid.items()))
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:53:37 2026
+
+Sweep work queue on a shared filesystem
+
+The FlagCorr_* and Final2_* sweeps need more CPU than one machine. A sweep
+folder on a filesystem that every node mounts holds the work as small JSON
+files in three subfolders:
+
+    pending/  units waiting to run, one per (series, p, d, cycles, shard)
+    running/  claimed units; the file's modification time is the heartbeat
+    done/     the counts of finished units
+
+submit (the coordinator, once) writes the pending units, each with its own
+seed. work (on every node, any number of processes) claims a unit by renaming
+it from pending/ to running/. The rename is atomic, so exactly one worker gets
+every unit. While the unit runs, a thread touches the running file. The counts
+go to a temporary file that is renamed into done/, so a unit is either done or
+not. A unit whose heartbeat is older than the timeout (a crashed or stalled
+worker) is renamed back to pending/ by the next worker that looks. When a
+reclaimed unit finishes twice, done/ keeps one result.
+
+merge adds up the finished shards per (series, p, d, cycles) and can write them
+as the {series}_perstep{p}_cycles{cycles}_dimension{d}.csv files of Data_paper,
+one rate per shard.
+
+@author: James Keppens
+"""
+#Imports
+import json
+import os
+import socket
+import threading
+import time
+import numpy as np
+
+_FOLDERS = ('pending', 'running', 'done')
+
+def unit_name(unit):
+    return f"{unit['series']}_perstep{unit['p']:.5f}_cycles{unit['cycles']}_dimension{unit['d']}_shard{unit['shard']}"
+
+def _write(path, data):
+    # Write next to the target and rename, so readers never see a partial file
+    temporary = f'{path}.{socket.gethostname()}.{os.getpid()}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+def submit(folder, series, ps, dims, cycles, shards, shots, seed=None):
+    """Write one pending unit per (p, d, shard) with its own seed; units that already exist are left alone. Returns the number written."""
+    for name in _FOLDERS:
+        os.makedirs(os.path.join(folder, name), exist_ok=True)
+    units = [{'series': series, 'p': float(p), 'd': int(d), 'cycles': int(cycles), 'shard': shard, 'shots': int(shots)}
+             for p in ps for d in dims for shard in range(shards)]
+    seeds = np.random.SeedSequence(seed).generate_state(len(units))
+    written = 0
+    for unit, unit_seed in zip(units, seeds):
+        unit['seed'] = int(unit_seed)
+        name = unit_name(unit) + '.json'
+        if any(os.path.exists(os.path.join(folder, sub, name)) for sub in _FOLDERS):
+            continue
+        _write(os.path.join(folder, 'pending', name), unit)
+        written += 1
+    return written
+
+def status(folder):
+    return {name: sum(1 for f in os.listdir(os.path.join(folder, name)) if f.endswith('.json')) for name in _FOLDERS}
+
+def reclaim(folder, timeout):
+    """Move running units without a heartbeat for timeout seconds back to pending; returns their number."""
+    reclaimed = 0
+    now = time.time()
+    for name in os.listdir(os.path.join(folder, 'running')):
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(folder, 'running', name)
+        try:
+            if now - os.path.getmtime(path) > timeout:
+                os.rename(path, os.path.join(folder, 'pending', name))
+                reclaimed += 1
+        except FileNotFoundError:
+            # Finished or reclaimed by another worker in the meantime
+            pass
+    return reclaimed
+
+def claim(folder):
+    """Take one pending unit by renaming it to running/; returns the unit, or None when nothing is pending."""
+    names = sorted(name for name in os.listdir(os.path.join(folder, 'pending')) if name.endswith('.json'))
+    # Start at a different place per process, so workers do not all race for the same file
+    start = os.getpid() % len(names) if names else 0
+    for name in names[start:] + names[:start]:
+        pending = os.path.join(folder, 'pending', name)
+        path = os.path.join(folder, 'running', name)
+        try:
+            # Fresh modification time first: the rename keeps it, so the unit is never running with an old heartbeat
+            os.utime(pending)
+            os.rename(pending, path)
+        except FileNotFoundError:
+            continue
+        return _read(path)
+    return None
+
+def _heartbeat(path, interval, stop):
+    while not stop.wait(interval):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return
+
+def complete(folder, unit, counts):
+    name = unit_name(unit) + '.json'
+    _write(os.path.join(folder, 'done', name), dict(unit, counts=counts, worker=f'{socket.gethostname()}:{os.getpid()}'))
+    try:
+        os.remove(os.path.join(folder, 'running', name))
+    except FileNotFoundError:
+        pass
+
+def work(folder, run, timeout: float = 3600, heartbeat: float = 60, max_units=None, wait: bool = False):
+    """Claim and run units until none are pending; run(unit) returns a dict of counts (e.g. errors, flags, shots).
+
+    With wait=True, keep polling while other workers still run units, to take over the ones they drop.
+    Returns the number of units this worker finished.
+    """
+    finished = 0
+    while max_units is None or finished < max_units:
+        reclaim(folder, timeout)
+        unit = claim(folder)
+        if unit is None:
+            if wait and status(folder)['running'] > 0:
+                time.sleep(heartbeat)
+                continue
+            break
+        path = os.path.join(folder, 'running', unit_name(unit) + '.json')
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(path, heartbeat, stop), daemon=True)
+        beat.start()
+        try:
+            counts = run(unit)
+        finally:
+            stop.set()
+            beat.join()
+        complete(folder, unit, counts)
+        finished += 1
+    return finished
+
+def merge(folder, output_folder=None):
+    """Sum the counts of the finished shards per (series, p, d, cycles).
+
+    With output_folder, also write every sweep point as a CSV of errors/shots per shard, like the files in Data_paper.
+    """
+    shards = {}
+    for name in sorted(os.listdir(os.path.join(folder, 'done'))):
+        if name.endswith('.json'):
+            result = _read(os.path.join(folder, 'done', name))
+            shards.setdefault((result['series'], result['p'], result['d'], result['cycles']), {})[result['shard']] = result['counts']
+    merged = {}
+    for key, results in shards.items():
+        total = {}
+        for counts in results.values():
+            for name, value in counts.items():
+                total[name] = total.get(name, 0) + value
+        total['shards'] = len(results)
+        merged[key] = total
+        if output_folder is not None:
+            series, p, d, cycles = key
+            os.makedirs(output_folder, exist_ok=True)
+            with open(os.path.join(output_folder, f'{series}_perstep{p:.5f}_cycles{cycles}_dimension{d}.csv'), 'w', newline='') as f:
+                for shard in sorted(results):
+                    f.write(f"{results[shard]['errors'] / results[shard]['shots']:.12f}\n")
+    return merged
@@ -4,117 +4,159 @@ Created on Thu 10 apr 16:41:58 2025
 
 Qudit Y gate
 
+Y(d, a, b, c) = w^c X^a Z^b with w = exp(2 pi i/d). The phase exponent c
+(0 by default) makes the integer powers Y gates again:
+Y(d, a, b, c)^k = Y(d, a*k, b*k, c*k - a*b*k(k-1)/2).
+
 @author: James Keppens
 Based on https://quantumai.google/cirq/build/qudits
 """
 #Imports
-import cirq
 import numpy as np
+import GateCore
+import Kernels
 
-class Y(cirq.Gate):
-    
-    def __init__(self, d: int, a: int, b: int) -> None:
-        self._d = d
-        self._a = a
-        self._b = b
-    
-    """A gate that enacts the Y_q gate on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_shift_matrix(self, d, a):
-        if d < 2:
-            raise ValueError("Dimension 'd' must be at least 2.")
-        if a > d:
-            raise ValueError("Shift cannot be larger than the Dimension 'd'")
-        # Perform the shift operation (x -> x+1 mod d) on the matrix
-        shift_matrix = np.roll(np.eye(d), -1*a, axis=0)
-        
-        return shift_matrix
-
-    def create_roots_of_unity_matrix(self, d, b):
-        if d < 1:
-            raise ValueError("Dimension 'd' must be at least 1.")
-        if b > d:
-            raise ValueError("b cannot be larger than the Dimension 'd'")
-        # Compute the d squared roots of unity
-        roots = [np.exp(2j * np.pi * ((k*b)%d) / d) for k in range(d)]
+def _gates():
+    import cirq
+
+    @cirq.value_equality(manual_cls=True)
+    class Y(cirq.Gate):
         
-        # Create a diagonal matrix with the roots of unity
-        roots_matrix = np.diag(roots)
+        def __init__(self, d: int, a: int, b: int, c: int = 0) -> None:
+            self._d = d
+            self._a = a
+            self._b = b
+            self._c = c
         
-        return roots_matrix
-
-    def compute_Y(self):
-        X = np.array(self.create_shift_matrix(self._d,self._a),dtype=np.complex64)
-        Z = np.array(self.create_roots_of_unity_matrix(self._d,self._b),dtype=np.complex64)
-        return X @ Z
-
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(self.compute_Y(),dtype=np.complex64)
-
-    def _circuit_diagram_info_(self, args):
-        return f'[Y({self._a,self._b})]'
-    
-class Ydag(cirq.Gate):
-    
-    def __init__(self, d: int, a: int, b: int) -> None:
-        self._d = d
-        self._a = a
-        self._b = b
-    
-    """A gate that enacts the Y^dagger on a qudit.
-    """
-
-    def _qid_shape_(self):
-        # By implementing this method this gate implements the
-        # cirq.qid_shape protocol and will return the tuple (d,)
-        # when cirq.qid_shape acts on an instance of this class.
-        return (self._d,)
-
-    def _validate_args(self, qubits):
-        return True 
-
-    def create_shift_matrix(self, d, a):
-        if d < 2:
-            raise ValueError("Dimension 'd' must be at least 2.")
-        if a > d:
-            raise ValueError("Shift cannot be larger than the Dimension 'd'")
-        # Perform the shift operation (x -> x+1 mod d) on the matrix
-        shift_matrix = np.roll(np.eye(d), -1*a, axis=0)
+        """A gate that enacts the Y_q gate on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, self._a % self._d, self._b % self._d, self._c % self._d
+
+        def _value_equality_values_cls_(self):
+            return Y
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            k = int(exponent)
+            if k == -1 and self._c % self._d == 0:
+                return Ydag(self._d, self._a, self._b)
+            # (X^a Z^b)^k = w^(-a*b*k(k-1)/2) X^(a*k) Z^(b*k), since Z X = w^-1 X Z for X|x〉 = |x - 1〉
+            c = self._c * k - self._a * self._b * k * (k - 1) // 2
+            return Y(self._d, (self._a * k) % self._d, (self._b * k) % self._d, c % self._d)
+
+        def create_shift_matrix(self, d, a):
+            return GateCore.shift_matrix(d, a)
+
+        def create_roots_of_unity_matrix(self, d, b):
+            return GateCore.roots_of_unity_matrix(d, b)
+
+        def compute_Y(self):
+            X = np.array(self.create_shift_matrix(self._d,self._a),dtype=np.complex64)
+            Z = np.array(self.create_roots_of_unity_matrix(self._d,self._b),dtype=np.complex64)
+            return X @ Z
+
+        def _phase(self):
+            return np.exp(2j * np.pi * (self._c % self._d) / self._d)
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(self._phase() * self.compute_Y(),dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            perm, phases = GateCore.pauli_monomial(self._d, self._a, self._b)
+            return perm, phases * self._phase()
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
+
+        def _circuit_diagram_info_(self, args):
+            if self._c % self._d:
+                return f'[Y({self._a,self._b,self._c})]'
+            return f'[Y({self._a,self._b})]'
         
-        return shift_matrix
-
-    def create_roots_of_unity_matrix(self, d, b):
-        if d < 1:
-            raise ValueError("Dimension 'd' must be at least 1.")
-        if b > d:
-            raise ValueError("b cannot be larger than the Dimension 'd'")
-        # Compute the d squared roots of unity
-        roots = [np.exp(2j * np.pi * ((k*b)%d) / d) for k in range(d)]
+    @cirq.value_equality(manual_cls=True)
+    class Ydag(cirq.Gate):
         
-        # Create a diagonal matrix with the roots of unity
-        roots_matrix = np.diag(roots)
+        def __init__(self, d: int, a: int, b: int) -> None:
+            self._d = d
+            self._a = a
+            self._b = b
         
-        return roots_matrix
+        """A gate that enacts the Y^dagger on a qudit.
+        """
+
+        def _qid_shape_(self):
+            # By implementing this method this gate implements the
+            # cirq.qid_shape protocol and will return the tuple (d,)
+            # when cirq.qid_shape acts on an instance of this class.
+            return (self._d,)
+
+        def _validate_args(self, qubits):
+            return True 
+
+        def _value_equality_values_(self):
+            return self._d, self._a % self._d, self._b % self._d
+
+        def _value_equality_values_cls_(self):
+            return Ydag
+
+        def _has_unitary_(self):
+            return True
+
+        def __pow__(self, exponent):
+            if not isinstance(exponent, (int, np.integer)):
+                return NotImplemented
+            if exponent == 1:
+                return self
+            return Y(self._d, self._a, self._b).__pow__(-exponent)
+
+        def create_shift_matrix(self, d, a):
+            return GateCore.shift_matrix(d, a)
+
+        def create_roots_of_unity_matrix(self, d, b):
+            return GateCore.roots_of_unity_matrix(d, b)
+
+        def compute_Y(self):
+            X = np.array(self.create_shift_matrix(self._d,self._a),dtype=np.complex64)
+            Z = np.array(self.create_roots_of_unity_matrix(self._d,self._b),dtype=np.complex64)
+            return X @ Z
+
+        def _unitary_(self):
+            # create the unitary matrix
+            return np.array(np.conjugate(self.compute_Y()).T,dtype=np.complex64)
+
+        def _monomial_(self):
+            # U|x〉 = phases[x]|perm[x]〉
+            return GateCore.monomial_inverse(*GateCore.pauli_monomial(self._d, self._a, self._b))
+
+        def _apply_unitary_(self, args):
+            return Kernels.apply_monomial(args.target_tensor, args.available_buffer, args.axes, self._qid_shape_(), *self._monomial_())
+
+        def sparse_unitary(self):
+            return GateCore.monomial_to_sparse(*self._monomial_())
 
-    def compute_Y(self):
-        X = np.array(self.create_shift_matrix(self._d,self._a),dtype=np.complex64)
-        Z = np.array(self.create_roots_of_unity_matrix(self._d,self._b),dtype=np.complex64)
-        return X @ Z
+        def _circuit_diagram_info_(self, args):
+            return f'[Y*({self._a,self._b})]'
 
-    def _unitary_(self):
-        # create the unitary matrix
-        return np.array(np.conjugate(self.compute_Y()).T,dtype=np.complex64)
+    return Y, Ydag
 
-    def _circuit_diagram_info_(self, args):
-        return f'[Y*({self._a,self._b})]'
+__getattr__ = GateCore.lazy_gates(__name__, _gates)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:32:30 2026
+
+Coverage of the ThresholdSearch interval
+
+A synthetic binomial run with rate 50 p^2 crosses p at p = 0.02. The interval
+of many seeded searches has to hold the crossing at least as often as the
+confidence they report, also when the sign is tested after every batch.
+
+@author: James Keppens
+"""
+#Imports
+import numpy as np
+import ThresholdSearch
+
+def _coverage(batch, runs=200):
+    hits = 0
+    confidences = []
+    for seed in range(runs):
+        rng = np.random.default_rng(seed)
+        search = ThresholdSearch.ThresholdSearch(lambda d, p, shots: rng.binomial(shots, min(1.0, 50 * p * p)), dims=(2,), batch=batch, max_shots=50000)
+        result = search.search(0.005, 0.08)
+        low, high = result['interval']
+        hits += low <= 0.02 <= high
+        confidences.append(result['confidence'])
+    return hits / runs, float(np.mean(confidences))
+
+def test_coverage_sequential():
+    coverage, confidence = _coverage(batch=500)
+    assert coverage >= confidence
+
+def test_coverage_one_look():
+    coverage, confidence = _coverage(batch=50000)
+    assert coverage >= confidence